@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+团队日志列式归档（供统计分析）
+
+把同步下来的日志转换成按列存储的 numpy 数组，每篇日志一行：
+- member.npy            成员编码（int32，字典见 meta.json 的 members）
+- date.npy              日期（datetime64[D]）
+- tasks_done.npy / tasks_in_progress.npy / tasks_tomorrow.npy / blockers.npy
+                        各类条目数（int16）
+- project_offsets.npy / project_ids.npy
+                        已完成任务的项目编码（CSR：第 i 行为 ids[offsets[i]:offsets[i+1]]，
+                        字典见 meta.json 的 projects）
+- body_offsets.npy / bodies.bin
+                        正文（UTF-8，第 i 行为 bodies[offsets[i]:offsets[i+1]]）
+
+已有日志被修改时，以上文件整体重建为新一代（bodies.{gen}.bin、date.{gen}.npy 等），
+当前代数记录在 meta.json 的 gen。
+
+所有列都可以用 numpy.load(mmap_mode="r") 直接映射，一年的团队历史也只需向量化扫描。
+再次导出时只下载新增或修改过的日志（比较 sha），正文追加写入。
+
+依赖: numpy
+
+用法:
+    python archive.py export [team]                 # 增量导出
+    python archive.py stats [date_from] [date_to]   # 统计：项目任务数 / 日志提交率 / blocker 趋势
+"""
+
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import os
+import json
+import numpy as np
+from datetime import datetime
+from typing import Dict, List
+
+try:
+    from . import github_sync
+except ImportError:
+    import github_sync
+
+# ============ 配置 ============
+ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), ".log_archive")
+
+COUNT_COLUMNS = ("tasks_done", "tasks_in_progress", "tasks_tomorrow", "blockers")
+_COLUMN_DTYPES = {
+    "member": np.int32,
+    "date": "datetime64[D]",
+    **{name: np.int16 for name in COUNT_COLUMNS},
+}
+
+_BODIES_FILE = "bodies.bin"
+_META_FILE = "meta.json"
+# 有更新时整体重建为新一代的数据文件，按 meta 中的 gen 命名
+_DATA_FILES = tuple(f"{name}.npy" for name in _COLUMN_DTYPES) + (
+    "project_ids.npy", "project_offsets.npy", "body_offsets.npy", _BODIES_FILE)
+
+
+# ============ 提取 ============
+def split_body(content: str) -> str:
+    """去掉 Front Matter，返回正文"""
+    if content.startswith("---"):
+        end = content.find("\n---", 3)
+        if end != -1:
+            body_start = content.find("\n", end + 4)
+            return content[body_start + 1:] if body_start != -1 else ""
+    return content
+
+def summarize_log(content: str) -> Dict:
+    """
+    提取一篇日志的归档字段
+
+    Returns:
+        {"tasks_done": 2, "tasks_in_progress": 1, "tasks_tomorrow": 0, "blockers": 1,
+         "projects": ["ai-tutor", "ai-tutor"], "body": "..."}
+        projects 为每条已完成任务的项目（不去重，便于按项目统计任务数）
+    """
+    fm = github_sync.parse_front_matter(content)
+
+    def _count(key: str) -> int:
+        value = fm.get(key)
+        return len(value) if isinstance(value, list) else 0
+
+    blockers = fm.get("blockers")
+    if isinstance(blockers, list):
+        blocker_count = len(blockers)
+    else:
+        blocker_count = sum(
+            len(task.get("blockers") or [])
+            for task in fm.get("tasks_in_progress") or []
+            if isinstance(task, dict) and isinstance(task.get("blockers"), list)
+        )
+
+    projects = [
+        str(task["project"]).strip()
+        for task in fm.get("tasks_done") or []
+        if isinstance(task, dict) and task.get("project")
+    ]
+
+    return {
+        "tasks_done": _count("tasks_done"),
+        "tasks_in_progress": _count("tasks_in_progress"),
+        "tasks_tomorrow": _count("tasks_tomorrow"),
+        "blockers": blocker_count,
+        "projects": [p for p in projects if p],
+        "body": split_body(content),
+    }
+
+
+# ============ 归档 ============
+def _save_npy(path: str, array: np.ndarray):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp, path)
+
+def _file_name(name: str, gen: int = 0) -> str:
+    """数据文件第 gen 代的文件名：第 0 代为原名，之后为 bodies.3.bin / date.3.npy"""
+    if gen == 0:
+        return name
+    base, ext = os.path.splitext(name)
+    return f"{base}.{gen}{ext}"
+
+class LogArchive:
+    """
+    可增量追加的列式归档
+
+    add() 先缓存在内存，save() 时统一写盘：
+    - 新日志追加到各列末尾，正文追加到 bodies.bin
+    - 已有日志（sha 变化）时所有列连同偏移量重建为新一代文件，旧文件保持不变
+    meta.json 最后写入，记录行数、字典、CSR 文件的代数和每行的路径 / sha；
+    中途中断时 meta.json 仍指向上一代完整的文件。
+    """
+
+    def __init__(self, archive_dir: str = ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        os.makedirs(archive_dir, exist_ok=True)
+
+        meta_path = os.path.join(archive_dir, _META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"rows": 0, "members": [], "projects": [], "paths": [], "shas": []}
+
+        self._rows = {path: i for i, path in enumerate(self.meta["paths"])}
+        self._member_codes = {m: i for i, m in enumerate(self.meta["members"])}
+        self._project_codes = {p: i for i, p in enumerate(self.meta["projects"])}
+        self._pending: List[Dict] = []
+        self._updates: Dict[int, Dict] = {}
+
+    def __len__(self) -> int:
+        return self.meta["rows"] + len(self._pending)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.archive_dir, name)
+
+    def _code(self, codes: Dict[str, int], names: List[str], value: str) -> int:
+        if value not in codes:
+            codes[value] = len(names)
+            names.append(value)
+        return codes[value]
+
+    # ---------- 更新 ----------
+    def get_sha(self, path: str):
+        row = self._rows.get(path)
+        return self.meta["shas"][row] if row is not None else None
+
+    def add(self, path: str, content: str, member_id: str, date: str, sha: str = None) -> bool:
+        """
+        写入一篇日志（已存在则覆盖）
+
+        Returns:
+            是否实际写入（sha 与归档中一致时跳过）
+        """
+        row = self._rows.get(path)
+        if row is not None and sha and self.meta["shas"][row] == sha:
+            return False
+
+        summary = summarize_log(content)
+        record = {
+            "member": self._code(self._member_codes, self.meta["members"], member_id),
+            "date": np.datetime64(date, "D"),
+            **{name: summary[name] for name in COUNT_COLUMNS},
+            "projects": [self._code(self._project_codes, self.meta["projects"], p)
+                         for p in summary["projects"]],
+            "body": summary["body"].encode("utf-8"),
+        }
+
+        if row is None:
+            row = len(self.meta["paths"])
+            self._rows[path] = row
+            self.meta["paths"].append(path)
+            self.meta["shas"].append(sha)
+            self._pending.append(record)
+        elif row < self.meta["rows"]:
+            self._updates[row] = record
+            self.meta["shas"][row] = sha
+        else:
+            self._pending[row - self.meta["rows"]] = record
+            self.meta["shas"][row] = sha
+        return True
+
+    # ---------- 写盘 ----------
+    def _load(self, name: str, dtype, extra: int = 0, length: int = None) -> np.ndarray:
+        """
+        读取一列，截取到 meta 登记的 rows + extra 个元素（偏移量列 extra=1），
+        或显式给定的 length 个元素
+
+        save() 中途中断时各 .npy 可能已比 meta.json 多出未登记的行，截断后保持行对齐。
+        """
+        path = self._path(_file_name(f"{name}.npy", self.meta.get("gen", 0)))
+        if self.meta["rows"] and os.path.exists(path):
+            return np.load(path)[:self.meta["rows"] + extra if length is None else length]
+        return np.zeros(extra, dtype=dtype)
+
+    def save(self):
+        """把缓存的写入落盘"""
+        if not self._pending and not self._updates:
+            return
+        old_rows = self.meta["rows"]
+        old_gen = self.meta.get("gen", 0)
+        # 有更新时所有列写到新一代文件，旧文件在 meta.json 切换前保持不变
+        gen = old_gen + 1 if self._updates else old_gen
+
+        # 定长列：更新 + 末尾追加
+        for name, dtype in _COLUMN_DTYPES.items():
+            column = self._load(name, dtype)
+            for row, record in self._updates.items():
+                column[row] = record[name]
+            appended = np.array([r[name] for r in self._pending], dtype=dtype)
+            _save_npy(self._path(_file_name(f"{name}.npy", gen)), np.concatenate([column, appended]))
+
+        # 项目编码（CSR），体积小，每次整体重写
+        offsets = self._load("project_offsets", np.int64, 1)
+        ids = self._load("project_ids", np.int32, length=int(offsets[-1]))
+        if self._updates:
+            per_row = [ids[offsets[i]:offsets[i + 1]] for i in range(old_rows)]
+            for row, record in self._updates.items():
+                per_row[row] = np.array(record["projects"], dtype=np.int32)
+            ids = np.concatenate(per_row) if per_row else np.zeros(0, dtype=np.int32)
+            offsets = np.concatenate([[0], np.cumsum([len(p) for p in per_row])]).astype(np.int64)
+        new_ids = [np.array(r["projects"], dtype=np.int32) for r in self._pending]
+        ids = np.concatenate([ids] + new_ids).astype(np.int32)
+        offsets = np.concatenate([
+            offsets, offsets[-1] + np.cumsum([len(p) for p in new_ids], dtype=np.int64)
+        ]).astype(np.int64)
+        _save_npy(self._path(_file_name("project_ids.npy", gen)), ids)
+        _save_npy(self._path(_file_name("project_offsets.npy", gen)), offsets)
+
+        # 正文：没有更新时只在末尾追加；有更新时重建文件
+        body_offsets = self._load("body_offsets", np.int64, 1)
+        bodies_path = self._path(_file_name(_BODIES_FILE, gen))
+        if self._updates:
+            old = b""
+            if old_rows:
+                with open(self._path(_file_name(_BODIES_FILE, old_gen)), "rb") as f:
+                    old = f.read()
+            segments = [old[body_offsets[i]:body_offsets[i + 1]] for i in range(old_rows)]
+            for row, record in self._updates.items():
+                segments[row] = record["body"]
+            segments += [r["body"] for r in self._pending]
+            with open(bodies_path, "wb") as f:
+                f.write(b"".join(segments))
+            body_offsets = np.concatenate([[0], np.cumsum([len(b) for b in segments])])
+        else:
+            new_bodies = [r["body"] for r in self._pending]
+            with open(bodies_path, "ab") as f:
+                # 上次写入中断时文件尾部可能有未登记的数据，从登记的末尾开始写
+                f.truncate(int(body_offsets[-1]))
+                f.write(b"".join(new_bodies))
+            body_offsets = np.concatenate([
+                body_offsets, body_offsets[-1] + np.cumsum([len(b) for b in new_bodies])
+            ])
+        _save_npy(self._path(_file_name("body_offsets.npy", gen)), body_offsets.astype(np.int64))
+
+        self.meta["rows"] = old_rows + len(self._pending)
+        self.meta["gen"] = gen
+        self.meta["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        meta_path = self._path(_META_FILE)
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+        os.replace(tmp, meta_path)
+
+        if gen != old_gen:
+            for name in _DATA_FILES:
+                try:
+                    os.remove(self._path(_file_name(name, old_gen)))
+                except FileNotFoundError:
+                    pass
+
+        self._pending = []
+        self._updates = {}
+
+
+# ============ 读取 ============
+def open_archive(archive_dir: str = ARCHIVE_DIR) -> Dict:
+    """
+    以内存映射方式打开归档
+
+    Returns:
+        {"member": ndarray, "date": ndarray, "tasks_done": ndarray, ...,
+         "project_offsets": ndarray, "project_ids": ndarray,
+         "body_offsets": ndarray, "bodies": memmap(uint8),
+         "members": [...], "projects": [...], "paths": [...]}
+        数组均为只读映射；归档为空时为长度 0 的数组
+    """
+    meta_path = os.path.join(archive_dir, _META_FILE)
+    meta = {"rows": 0, "members": [], "projects": [], "paths": []}
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+    gen = meta.get("gen", 0)
+    archive = {"members": meta["members"], "projects": meta["projects"], "paths": meta["paths"]}
+    columns = {**_COLUMN_DTYPES, "project_ids": np.int32,
+               "project_offsets": np.int64, "body_offsets": np.int64}
+    for name, dtype in columns.items():
+        path = os.path.join(archive_dir, _file_name(f"{name}.npy", gen))
+        extra = 1 if name.endswith("offsets") else 0
+        if meta["rows"]:
+            archive[name] = np.load(path, mmap_mode="r")
+        else:
+            archive[name] = np.zeros(extra, dtype=dtype)
+        if name != "project_ids":
+            # 只取 meta 登记的行，忽略中断写入留下的多余数据
+            archive[name] = archive[name][:meta["rows"] + extra]
+    archive["project_ids"] = archive["project_ids"][:archive["project_offsets"][-1]]
+
+    bodies_path = os.path.join(archive_dir, _file_name(_BODIES_FILE, gen))
+    if meta["rows"] and os.path.getsize(bodies_path):
+        archive["bodies"] = np.memmap(bodies_path, dtype=np.uint8, mode="r")[:archive["body_offsets"][-1]]
+    else:
+        archive["bodies"] = np.zeros(0, dtype=np.uint8)
+    return archive
+
+def read_body(archive: Dict, row: int) -> str:
+    """读取第 row 行的正文"""
+    start, end = archive["body_offsets"][row], archive["body_offsets"][row + 1]
+    return archive["bodies"][start:end].tobytes().decode("utf-8")
+
+
+# ============ 统计 ============
+def _date_mask(archive: Dict, date_from: str = None, date_to: str = None) -> np.ndarray:
+    dates = archive["date"]
+    mask = np.ones(len(dates), dtype=bool)
+    if date_from:
+        mask &= dates >= np.datetime64(date_from, "D")
+    if date_to:
+        mask &= dates <= np.datetime64(date_to, "D")
+    return mask
+
+def tasks_per_project(archive: Dict, date_from: str = None, date_to: str = None) -> Dict[str, int]:
+    """已完成任务数按项目统计，按任务数倒序"""
+    offsets = archive["project_offsets"]
+    # 每个项目编码所属的行号，用于按日期过滤
+    rows = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    ids = np.asarray(archive["project_ids"])[_date_mask(archive, date_from, date_to)[rows]]
+    counts = np.bincount(ids, minlength=len(archive["projects"]))
+    order = np.argsort(-counts, kind="stable")
+    return {archive["projects"][i]: int(counts[i]) for i in order if counts[i]}
+
+def logging_compliance(archive: Dict, date_from: str, date_to: str) -> Dict[str, Dict]:
+    """
+    日志提交率：每位成员在工作日中有日志的天数占比
+
+    Returns:
+        {member_id: {"days_logged": 18, "workdays": 22, "rate": 0.82}}
+    """
+    mask = _date_mask(archive, date_from, date_to)
+    workdays = int(np.busday_count(np.datetime64(date_from, "D"),
+                                   np.datetime64(date_to, "D") + 1))
+    members = np.asarray(archive["member"])[mask]
+    on_workday = np.is_busday(np.asarray(archive["date"])[mask])
+    logged = np.bincount(members[on_workday], minlength=len(archive["members"]))
+    return {
+        name: {"days_logged": int(logged[i]), "workdays": workdays,
+               "rate": round(float(logged[i]) / workdays, 2) if workdays else 0.0}
+        for i, name in enumerate(archive["members"])
+    }
+
+def blocker_trend(archive: Dict, date_from: str = None, date_to: str = None) -> Dict[str, int]:
+    """每周（以周一为键）的 blocker 总数"""
+    mask = _date_mask(archive, date_from, date_to)
+    dates = np.asarray(archive["date"])[mask]
+    blockers = np.asarray(archive["blockers"])[mask].astype(np.int64)
+    # 1970-01-01 是周四，偏移 3 天后按 7 天取整得到所在周的周一
+    weeks = ((dates.astype(np.int64) + 3) // 7) * 7 - 3
+    keys, inverse = np.unique(weeks, return_inverse=True)
+    totals = np.bincount(inverse, weights=blockers, minlength=len(keys))
+    return {str(np.datetime64(int(k), "D")): int(t) for k, t in zip(keys, totals)}
+
+
+# ============ 导出 ============
+def export_archive(
+    team: str = None,
+    member: str = None,
+    archive_dir: str = ARCHIVE_DIR,
+    client: github_sync.HubClient = None
+) -> Dict:
+    """
+    增量导出团队日志到列式归档
+
+    只读取目录列表比较 sha，新增或修改过的日志通过存储后端批量读取。
+    client 不传时使用默认客户端。
+
+    Returns:
+        {"exported": 新写入篇数, "total": 归档总篇数}
+    """
+    client = client or github_sync.get_default_client()
+    team = team or client.team
+    archive = LogArchive(archive_dir)
+
+    changed = {}
+    for member_id, log_files in client.list_team_log_files(team, member).items():
+        for log_file in log_files:
+            if archive.get_sha(log_file["path"]) != log_file["sha"]:
+                changed[log_file["path"]] = (member_id, log_file)
+
+    contents = client.get_backend().read_many(list(changed))
+    exported = 0
+    for path in sorted(contents, key=lambda p: changed[p][1]["name"]):
+        member_id, log_file = changed[path]
+        if archive.add(path, contents[path], member_id,
+                       log_file["name"].replace("_log.md", ""), sha=log_file["sha"]):
+            exported += 1
+
+    archive.save()
+    print(f"🗄️ 归档导出完成: 新增/更新 {exported} 篇，共 {len(archive)} 篇")
+    return {"exported": exported, "total": len(archive)}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("""
+团队日志列式归档
+
+用法:
+  python archive.py export [team]                 # 增量导出
+  python archive.py stats [date_from] [date_to]   # 统计
+        """)
+        sys.exit(1)
+
+    cmd = sys.argv[1]
+
+    if cmd == "export":
+        team = sys.argv[2] if len(sys.argv) > 2 else None
+        export_archive(team)
+
+    elif cmd == "stats":
+        archive = open_archive()
+        if not len(archive["date"]):
+            print("归档为空（先运行 export）")
+            sys.exit(0)
+        date_from = sys.argv[2] if len(sys.argv) > 2 else str(archive["date"].min())
+        date_to = sys.argv[3] if len(sys.argv) > 3 else str(archive["date"].max())
+
+        print(f"📊 {date_from} ~ {date_to}\n")
+        print("## 项目任务数")
+        for project, count in tasks_per_project(archive, date_from, date_to).items():
+            print(f"- {project}: {count}")
+        print("\n## 日志提交率（工作日）")
+        for member_id, c in logging_compliance(archive, date_from, date_to).items():
+            print(f"- {member_id}: {c['days_logged']}/{c['workdays']} ({c['rate']:.0%})")
+        print("\n## Blocker 趋势（按周）")
+        for week, total in blocker_trend(archive, date_from, date_to).items():
+            print(f"- {week}: {total}")
+
+    else:
+        print("❌ 未知命令")
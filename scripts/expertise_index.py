@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+成员专长索引：项目 / 学习主题 → 成员
+
+把每篇日志 front matter 里的 tasks_done[].project 和 ai_learning.topic
+汇总成本地索引，"谁懂 Remotion" 这类问题直接查索引，不用下载任何日志。
+
+用法:
+    python expertise_index.py sync [team]        # 增量同步索引
+    python expertise_index.py who-knows Remotion # 查询
+"""
+
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import os
+import json
+from datetime import datetime
+from typing import Dict, List
+
+try:
+    from . import github_sync
+except ImportError:
+    import github_sync
+
+# ============ 配置 ============
+INDEX_FILE = os.path.join(os.path.dirname(__file__), ".expertise_index.json")
+
+
+# ============ 提取 ============
+def extract_expertise(front_matter: Dict) -> Dict[str, List[str]]:
+    """
+    从 front matter 中提取项目和学习主题
+
+    Returns:
+        {"projects": [...], "topics": [...]}，均已去重
+    """
+    projects = []
+    for task in front_matter.get("tasks_done") or []:
+        if isinstance(task, dict) and task.get("project"):
+            projects.append(str(task["project"]).strip())
+
+    topics = []
+    ai_learning = front_matter.get("ai_learning")
+    if isinstance(ai_learning, dict) and ai_learning.get("topic"):
+        topics.append(str(ai_learning["topic"]).strip())
+
+    return {
+        "projects": list(dict.fromkeys(p for p in projects if p)),
+        "topics": list(dict.fromkeys(t for t in topics if t)),
+    }
+
+
+# ============ 索引 ============
+def load_index(index_file: str = INDEX_FILE) -> Dict:
+    """加载索引，不存在时返回空索引"""
+    if os.path.exists(index_file):
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"files": {}, "terms": {}, "updated_at": None}
+
+def save_index(index: Dict, index_file: str = INDEX_FILE):
+    """重新汇总 terms 并保存"""
+    index["terms"] = _aggregate(index["files"])
+    index["updated_at"] = datetime.now().isoformat()
+    tmp = index_file + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, index_file)
+
+def index_log(index: Dict, path: str, content: str, sha: str = None,
+              member_id: str = None, date: str = None):
+    """
+    把一篇日志写入索引（同一路径覆盖旧记录）
+
+    成员和日期优先取 front matter，缺失时用参数兜底。
+    """
+    front_matter = github_sync.parse_front_matter(content)
+    expertise = extract_expertise(front_matter)
+    index["files"][path] = {
+        "sha": sha,
+        "member_id": front_matter.get("member_id") or member_id,
+        "member_name": front_matter.get("member_name") or member_id,
+        "date": front_matter.get("date") or date,
+        **expertise,
+    }
+
+def _aggregate(files: Dict[str, Dict]) -> Dict[str, Dict]:
+    """
+    按 项目/主题 汇总成员
+
+    Returns:
+        {小写名称: {"name": 原名, "kind": "project"/"topic",
+                   "members": {member_id: {"member_name", "count", "last_active"}}}}
+    """
+    terms = {}
+    for entry in files.values():
+        member_id = entry.get("member_id")
+        if not member_id:
+            continue
+        for kind, names in (("project", entry.get("projects", [])),
+                            ("topic", entry.get("topics", []))):
+            for name in names:
+                term = terms.setdefault(name.lower(), {"name": name, "kind": kind, "members": {}})
+                stats = term["members"].setdefault(member_id, {
+                    "member_name": entry.get("member_name") or member_id,
+                    "count": 0,
+                    "last_active": "",
+                })
+                stats["count"] += 1
+                if (entry.get("date") or "") > stats["last_active"]:
+                    stats["last_active"] = entry["date"]
+    return terms
+
+
+# ============ 同步 ============
+def sync_index(
+    team: str = None,
+    member: str = None,
+    index_file: str = INDEX_FILE,
+    client: github_sync.HubClient = None
+) -> Dict:
+    """
+    增量同步专长索引
+
+    只读取目录列表比较 sha，新增或修改过的日志才会下载。
+    client 不传时使用默认客户端。
+
+    Returns:
+        {"indexed": 新写入篇数, "total": 索引总篇数}
+    """
+    client = client or github_sync.get_default_client()
+    team = team or client.team
+    index = load_index(index_file)
+    indexed = 0
+
+    for member_id, log_files in client.list_team_log_files(team, member).items():
+        for log_file in log_files:
+            known = index["files"].get(log_file["path"])
+            if known and known.get("sha") == log_file["sha"]:
+                continue
+            # 专长只来自 Front Matter，读到即停止下载
+            content = client.fetch_log_file(log_file, until=github_sync.front_matter_complete)
+            if content is None:
+                continue
+            index_log(index, log_file["path"], content, sha=log_file["sha"],
+                      member_id=member_id, date=log_file["name"].replace("_log.md", ""))
+            indexed += 1
+
+    save_index(index, index_file)
+    print(f"🧭 专长索引同步完成: 新增/更新 {indexed} 篇，共 {len(index['files'])} 篇")
+    return {"indexed": indexed, "total": len(index["files"])}
+
+
+# ============ 查询 ============
+def who_knows(query: str, limit: int = 10, index_file: str = INDEX_FILE) -> List[Dict]:
+    """
+    查询谁做过某个项目 / 学过某个主题（只读本地索引）
+
+    名称按子串匹配（大小写不敏感），"remotion" 会同时命中 "Remotion" 和 "remotion-video"。
+
+    Returns:
+        按次数、最近活跃日期排序：
+        [{"member_id": "...", "member_name": "...", "count": 3,
+          "last_active": "2026-03-09", "matched": ["remotion-video"]}, ...]
+
+    Examples:
+        who_knows("Remotion")
+        who_knows("agent-hub")
+    """
+    terms = load_index(index_file)["terms"]
+    q = query.strip().lower()
+    if not q:
+        return []
+
+    keys = [k for k in terms if q in k]
+
+    members = {}
+    for key in keys:
+        term = terms[key]
+        for member_id, stats in term["members"].items():
+            m = members.setdefault(member_id, {
+                "member_id": member_id,
+                "member_name": stats["member_name"],
+                "count": 0,
+                "last_active": "",
+                "matched": [],
+            })
+            m["count"] += stats["count"]
+            m["last_active"] = max(m["last_active"], stats["last_active"])
+            m["matched"].append(term["name"])
+
+    results = sorted(members.values(),
+                     key=lambda m: (m["count"], m["last_active"]), reverse=True)
+    return results[:limit]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("""
+成员专长索引
+
+用法:
+  python expertise_index.py sync [team]       # 增量同步索引
+  python expertise_index.py who-knows <关键词> # 谁做过 / 学过
+        """)
+        sys.exit(1)
+
+    cmd = sys.argv[1]
+
+    if cmd == "sync":
+        team = sys.argv[2] if len(sys.argv) > 2 else None
+        sync_index(team)
+
+    elif cmd == "who-knows" and len(sys.argv) >= 3:
+        query = " ".join(sys.argv[2:])
+        results = who_knows(query)
+        if not results:
+            print(f"索引中没有关于 {query} 的记录（先运行 sync 更新索引）")
+        for r in results:
+            print(f"👤 {r['member_name']} ({r['member_id']})  {r['count']} 次  最近: {r['last_active']}")
+            print(f"   相关: {', '.join(r['matched'])}")
+
+    else:
+        print("❌ 未知命令")
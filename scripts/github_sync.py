@@ -2,14 +2,34 @@
 """
 AIEC Agent Hub - GitHub 日志同步工具 (改进版)
 支持在 Claude 环境中运行
+
+所有网络状态（token、仓库、分支、成员身份、HTTP 会话、缓存、并发限制）
+都保存在 HubClient 实例上，一个进程可以同时为多位成员 / 多个仓库服务；
+模块级函数（push_log / pull_log / search_team_logs ...）使用默认客户端。
 """
 
 import requests
+import ast
+import asyncio
 import base64
 import os
+import json
+import time
+import codecs
+import re
+import threading
 import urllib.parse
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable
+
+try:
+    from .keyword_matcher import KeywordMatcher, excerpt_at
+    from .storage import StorageBackend, LocalCloneBackend
+    from . import progressive
+except ImportError:
+    from keyword_matcher import KeywordMatcher, excerpt_at
+    from storage import StorageBackend, LocalCloneBackend
+    import progressive
 
 # ============ 配置 ============
 REPO = "AIEC-Team/AIEC-agent-hub"
@@ -28,38 +48,56 @@ TEAM_DIRS = {
 
 WEEKDAYS_EN = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
-# ============ Token 管理 ============
-_token = None
+# 离线推送队列（write-ahead spool），网络失败或延迟推送的日志先落盘
+SPOOL_FILE = os.path.join(os.path.dirname(__file__), ".push_spool.jsonl")
+FLUSH_RETRIES = 3
 
-def set_token(token: str):
-    """设置 GitHub token（供 Claude 调用）"""
-    global _token
-    _token = token
+# 设置后默认使用本地克隆后端（克隆根目录，每个仓库一个子目录），否则走 REST API
+CLONE_DIR_ENV = "AIEC_HUB_CLONE_DIR"
 
-def get_token() -> str:
-    """获取 token，优先级：set_token() > 环境变量"""
-    if _token:
-        return _token
-    
-    # 尝试多个环境变量名
-    for var in ["GITHUB_PAT_TEAM_HUB", "GITHUB_TOKEN", "GH_TOKEN"]:
+# 每个客户端同时进行的 HTTP 请求数上限、条件请求缓存条目上限
+MAX_CONCURRENT_REQUESTS = 8
+CACHE_MAX_ENTRIES = 512
+
+# 单个日志文件的读取上限（字节），超过则放弃读取；流式读取的分块大小
+MAX_LOG_BYTES = 1024 * 1024
+RAW_CHUNK_SIZE = 8192
+
+# ============ Token 管理 ============
+TOKEN_ENV_VARS = ["GITHUB_PAT_TEAM_HUB", "GITHUB_TOKEN", "GH_TOKEN"]
+
+def token_from_env() -> Optional[str]:
+    """按顺序尝试多个环境变量名"""
+    for var in TOKEN_ENV_VARS:
         token = os.environ.get(var)
         if token:
             return token
-    
-    raise EnvironmentError(
-        "❌ 未找到 GitHub Token\n"
-        "请通过以下方式之一设置：\n"
-        "1. 调用 set_token('ghp_xxx')\n"
-        "2. 设置环境变量 GITHUB_PAT_TEAM_HUB"
-    )
+    return None
 
-def get_headers() -> Dict[str, str]:
-    """获取认证头"""
-    return {
-        "Authorization": f"token {get_token()}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+# ============ 推送队列文件 ============
+def spool_file_for(repo: str = REPO, member_id: str = DEFAULT_MEMBER_ID, branch: str = BRANCH) -> str:
+    """
+    仓库 / 分支 / 成员对应的推送队列文件
+
+    默认身份沿用 SPOOL_FILE，其他身份各用一个文件，避免一个客户端 flush 时推走别人的日志
+    """
+    if (repo, member_id, branch) == (REPO, DEFAULT_MEMBER_ID, BRANCH):
+        return SPOOL_FILE
+    suffix = f"{repo.replace('/', '__')}.{member_id}"
+    if branch != BRANCH:
+        suffix += f".{branch.replace('/', '__')}"
+    return os.path.join(os.path.dirname(SPOOL_FILE), f".push_spool.{suffix}.jsonl")
+
+# 同一个队列文件的锁在所有客户端之间共享（追加锁、推送锁）
+_spool_locks: Dict[str, tuple] = {}
+_spool_locks_guard = threading.Lock()
+
+def _spool_file_locks(spool_file: str) -> tuple:
+    with _spool_locks_guard:
+        key = os.path.abspath(spool_file)
+        if key not in _spool_locks:
+            _spool_locks[key] = (threading.Lock(), threading.RLock())
+        return _spool_locks[key]
 
 # ============ 路径处理 ============
 def encode_path(path: str) -> str:
@@ -77,6 +115,15 @@ def get_file_path(member_id: str, team: str, date: str) -> str:
     return f"成员日志 members/{team_dir}/{member_id}/{date}_log.md"
 
 # ============ 日志生成 ============
+def _yaml_str(text) -> str:
+    """
+    写成 YAML 双引号字符串：转义反斜杠和双引号，换行换成空格（Front Matter 按行解析）
+
+    yaml.safe_load 和 parse_front_matter 读出的都是原文。
+    """
+    text = " ".join(str(text).splitlines())
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
 def create_log_content(
     member_id: str,
     member_name: str,
@@ -127,31 +174,31 @@ def create_log_content(
         if "done" in structured_data and structured_data["done"]:
             yaml_lines.append("tasks_done:")
             for task in structured_data["done"]:
-                yaml_lines.append(f"  - content: \"{task.get('content', '')}\"")
+                yaml_lines.append(f"  - content: {_yaml_str(task.get('content', ''))}")
                 if task.get("project"):
                     yaml_lines.append(f"    project: {task['project']}")
         
         if "in_progress" in structured_data and structured_data["in_progress"]:
             yaml_lines.append("tasks_in_progress:")
             for task in structured_data["in_progress"]:
-                yaml_lines.append(f"  - content: \"{task.get('content', '')}\"")
+                yaml_lines.append(f"  - content: {_yaml_str(task.get('content', ''))}")
                 if task.get("blockers"):
                     yaml_lines.append(f"    blockers: {task['blockers']}")
         
         if "tomorrow" in structured_data and structured_data["tomorrow"]:
             yaml_lines.append("tasks_tomorrow:")
             for task in structured_data["tomorrow"]:
-                yaml_lines.append(f"  - content: \"{task.get('content', '')}\"")
+                yaml_lines.append(f"  - content: {_yaml_str(task.get('content', ''))}")
         
         if "ai_learning" in structured_data and structured_data["ai_learning"]:
             al = structured_data["ai_learning"]
             yaml_lines.append("ai_learning:")
             if al.get("topic"):
-                yaml_lines.append(f"  topic: \"{al['topic']}\"")
+                yaml_lines.append(f"  topic: {_yaml_str(al['topic'])}")
             if al.get("insight"):
-                yaml_lines.append(f"  insight: \"{al['insight']}\"")
+                yaml_lines.append(f"  insight: {_yaml_str(al['insight'])}")
             if al.get("applied_to"):
-                yaml_lines.append(f"  applied_to: \"{al['applied_to']}\"")
+                yaml_lines.append(f"  applied_to: {_yaml_str(al['applied_to'])}")
         
         # 汇总 blockers（方便其他 Agent 快速查询）
         all_blockers = []
@@ -179,194 +226,1027 @@ def create_log_content(
 _synced at {datetime.now().strftime("%H:%M")}_
 """
 
-# ============ Push 日志 ============
-def push_log(
-    content: str,
-    member_id: str = DEFAULT_MEMBER_ID,
-    member_name: str = DEFAULT_MEMBER_NAME,
-    team: str = DEFAULT_TEAM,
-    date: str = None,
-    token: str = None,
-    structured_data: dict = None
-) -> Dict:
+# ============ 流式读取 ============
+# fetch_raw(until=...) 的提前结束条件：参数为已读到的文本，返回 True 即停止下载
+def front_matter_complete(text: str) -> bool:
+    """Front Matter 已完整读到（或文件没有 Front Matter）"""
+    if not text.startswith("---"):
+        return len(text) >= 3 or "\n" in text
+    end = text.find("\n---", 3)
+    return end != -1 and text.find("\n", end + 4) != -1
+
+def keyword_found(keyword: str, context: int = 2) -> Callable[[str], bool]:
+    """Front Matter 已读完，且找到关键词（大小写不敏感）并读到其后 context 行"""
+    keyword = keyword.lower()
+
+    def _until(text: str) -> bool:
+        pos = text.lower().find(keyword)
+        return pos != -1 and text.count("\n", pos) > context and front_matter_complete(text)
+
+    return _until
+
+
+# ============ 存储后端 ============
+class RestBackend(StorageBackend):
     """
-    推送日志到 GitHub
-    
+    GitHub REST contents API 后端（默认），逐文件读写
+
     Args:
-        content: 日志正文（不含 front matter 和标题）
-        member_id: 成员 ID
-        member_name: 成员姓名  
-        team: 团队
-        date: 日期，默认今天
-        token: GitHub token（可选，不传则用环境变量）
-        structured_data: A2A 结构化数据（可选）
-            示例: {
-                "done": [{"content": "完成xxx", "project": "proj"}],
-                "in_progress": [{"content": "进行中", "blockers": ["等xx"]}],
-                "tomorrow": [{"content": "明天做"}],
-                "ai_learning": {"topic": "xxx", "insight": "xxx"}
-            }
-    
-    Returns:
-        {"success": True, "url": "..."} 或 {"success": False, "error": "..."}
+        client: 所属 HubClient；不传时使用默认客户端，
+            通过 HubClient.set_backend() 设置时会自动绑定到该客户端
     """
-    if token:
-        set_token(token)
-    
-    if date is None:
-        date = datetime.now().strftime("%Y-%m-%d")
-    
-    path = get_file_path(member_id, team, date)
-    encoded_path = encode_path(path)
-    url = f"{API_BASE}/repos/{REPO}/contents/{encoded_path}"
-    
-    headers = get_headers()
-    
-    # 检查文件是否存在
-    sha = None
-    try:
-        r = requests.get(url, headers=headers, timeout=10)
+
+    def __init__(self, client: "HubClient" = None):
+        self.client = client
+
+    @property
+    def _client(self) -> "HubClient":
+        return self.client or get_default_client()
+
+    def read(self, path: str, until: Callable[[str], bool] = None) -> Optional[str]:
+        return self._client.fetch_raw(path, until=until)
+
+    def read_many(self, paths: List[str]) -> Dict[str, str]:
+        return self._client.fetch_logs_batch(paths)
+
+    def list_dir(self, path: str) -> List[Dict]:
+        client = self._client
+        r = client.get(client.contents_url(path), params={"ref": client.branch})
+        if r.status_code != 200:
+            return []
+        return r.json()
+
+    def write(self, path: str, content: str, message: str) -> Dict:
+        """
+        创建或更新单个文件
+
+        网络错误直接抛出 RequestException；服务端 5xx、频率超限和 sha 冲突（409/422）
+        返回 "retryable": True
+        """
+        client = self._client
+        url = client.contents_url(path)
+
+        # 检查文件是否存在（写操作前必须拿最新 sha，不走缓存）
+        sha = None
+        r = client.get(url, cached=False, params={"ref": client.branch})
         if r.status_code == 200:
             sha = r.json()["sha"]
-            print(f"📝 更新已有日志: {date}")
+            print(f"📝 更新已有日志: {path.rsplit('/', 1)[-1]}")
         elif r.status_code == 404:
-            print(f"📝 创建新日志: {date}")
+            print(f"📝 创建新日志: {path.rsplit('/', 1)[-1]}")
         elif r.status_code == 401:
             return {"success": False, "error": "Token 无效或已过期"}
+        elif r.status_code == 403 and r.headers.get("X-RateLimit-Remaining") == "0":
+            return {"success": False, "error": "API 频率超限", "retryable": True}
         elif r.status_code == 403:
             return {"success": False, "error": "Token 权限不足，需要 repo 权限"}
-    except requests.exceptions.RequestException as e:
-        return {"success": False, "error": f"网络错误: {e}"}
-    
-    # 生成完整内容
-    full_content = create_log_content(member_id, member_name, team, date, content, structured_data)
-    
-    # 构建请求
-    data = {
-        "message": f"📝 [{member_id}] Sync daily log for {date}",
-        "content": base64.b64encode(full_content.encode("utf-8")).decode("utf-8"),
-        "branch": BRANCH
-    }
-    if sha:
-        data["sha"] = sha
-    
-    # 推送
-    try:
-        response = requests.put(url, headers=headers, json=data, timeout=30)
-        
+
+        # 构建请求
+        data = {
+            "message": message,
+            "content": base64.b64encode(content.encode("utf-8")).decode("utf-8"),
+            "branch": client.branch
+        }
+        if sha:
+            data["sha"] = sha
+
+        response = client.request("PUT", url, json=data, timeout=30)
         if response.status_code in [200, 201]:
-            result = response.json()
-            file_url = result['content']['html_url']
-            print(f"✅ 推送成功!")
-            print(f"🔗 查看: {file_url}")
-            return {"success": True, "url": file_url}
-        else:
-            error_msg = f"HTTP {response.status_code}"
+            return {"success": True, "url": response.json()['content']['html_url']}
+
+        error_msg = f"HTTP {response.status_code}"
+        try:
+            error_detail = response.json().get("message", response.text[:200])
+            error_msg += f": {error_detail}"
+        except:
+            error_msg += f": {response.text[:200]}"
+        # 服务端错误、频率超限、期间有人更新了文件（sha 冲突）都可以稍后重试
+        retryable = (response.status_code >= 500 or response.status_code in (409, 422)
+                     or response.headers.get("X-RateLimit-Remaining") == "0")
+        return {"success": False, "error": error_msg, "retryable": retryable}
+
+    def write_many(self, files: Dict[str, str], message: str) -> Dict:
+        return self._client.commit_files(files, message)
+
+
+# ============ 客户端 ============
+class HubClient:
+    """
+    Agent Hub 客户端
+
+    每个实例独立持有 token、仓库、分支、成员身份、HTTP 会话、
+    条件请求缓存（ETag）、并发限制和推送队列，实例之间互不影响，
+    可以在多个线程 / asyncio 任务（asyncio.to_thread）中同时使用。
+
+    Args:
+        token: GitHub token，不传则读环境变量
+        repo: "owner/name"
+        branch: 分支
+        member_id / member_name / team: 成员身份，push_log 等的默认值
+        backend: 存储后端，不传则按环境变量选择 REST 或本地克隆
+        spool_file: 离线推送队列文件，默认按仓库 / 成员区分，见 spool_file_for
+        max_concurrency: 同时进行的 HTTP 请求数上限
+        max_file_size: 单个日志文件的读取上限（字节）
+
+    Examples:
+        alice = HubClient(token="ghp_a", member_id="alice", member_name="Alice")
+        bob = HubClient(token="ghp_b", member_id="bob", member_name="Bob", team="middle_east")
+        alice.push_log("## ✅ 完成\\n- ...")
+        bob.search_team_logs(keyword="飞书")
+    """
+
+    def __init__(
+        self,
+        token: str = None,
+        repo: str = REPO,
+        branch: str = BRANCH,
+        member_id: str = DEFAULT_MEMBER_ID,
+        member_name: str = DEFAULT_MEMBER_NAME,
+        team: str = DEFAULT_TEAM,
+        backend: StorageBackend = None,
+        spool_file: str = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        max_file_size: int = MAX_LOG_BYTES
+    ):
+        self.token = token
+        self.repo = repo
+        self.branch = branch
+        self.member_id = member_id
+        self.member_name = member_name
+        self.team = team
+        self.spool_file = spool_file or spool_file_for(repo, member_id, branch)
+        self.max_file_size = max_file_size
+
+        self._backend = None
+        if backend is not None:
+            self.set_backend(backend)
+
+        # requests.Session 不保证线程安全，每个线程各用一个
+        self._local = threading.local()
+        self._limiter = threading.BoundedSemaphore(max_concurrency)
+        self._cache: Dict[str, requests.Response] = {}
+        self._cache_lock = threading.Lock()
+        # 直接推送和 flush 互斥，避免队列里的旧版本在直接推送之后覆盖新版本；
+        # 两把锁都按队列文件共享，多个客户端用同一个文件时也不会丢记录
+        self._spool_lock, self._push_lock = _spool_file_locks(self.spool_file)
+        self._backend_lock = threading.Lock()
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[int] = None
+
+    # ---------- Token ----------
+    def set_token(self, token: str):
+        """设置 GitHub token（供 Claude 调用）"""
+        self.token = token
+
+    def get_token(self) -> str:
+        """获取 token，优先级：set_token() / 构造参数 > 环境变量"""
+        token = self.token or token_from_env()
+        if token:
+            return token
+
+        raise EnvironmentError(
+            "❌ 未找到 GitHub Token\n"
+            "请通过以下方式之一设置：\n"
+            "1. 调用 set_token('ghp_xxx')\n"
+            "2. 设置环境变量 GITHUB_PAT_TEAM_HUB"
+        )
+
+    def get_headers(self) -> Dict[str, str]:
+        """获取认证头"""
+        return {
+            "Authorization": f"token {self.get_token()}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+
+    # ---------- HTTP ----------
+    @property
+    def session(self) -> requests.Session:
+        """当前线程的 HTTP 会话（复用连接）"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def close(self):
+        """关闭当前线程的 HTTP 会话"""
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            session.close()
+            self._local.session = None
+
+    def contents_url(self, path: str) -> str:
+        return f"{API_BASE}/repos/{self.repo}/contents/{encode_path(path)}"
+
+    def request(self, method: str, url: str, headers: Dict[str, str] = None,
+                timeout: float = 10, **kwargs) -> requests.Response:
+        """
+        发送请求：受并发上限约束，并记录 rate limit
+
+        剩余额度用完时，先等到重置时间（最多 60 秒）再发。
+        """
+        if self.rate_limit_remaining == 0 and self.rate_limit_reset:
+            wait = self.rate_limit_reset - time.time()
+            if wait > 0:
+                time.sleep(min(wait, 60))
+
+        with self._limiter:
+            r = self.session.request(method, url, headers=headers or self.get_headers(),
+                                     timeout=timeout, **kwargs)
+
+        remaining = r.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+            reset = r.headers.get("X-RateLimit-Reset", "")
+            self.rate_limit_reset = int(reset) if reset.isdigit() else None
+        return r
+
+    def get(self, url: str, cached: bool = True, **kwargs) -> requests.Response:
+        """
+        GET 请求，带 ETag 条件缓存
+
+        内容未变时 GitHub 返回 304（不计入 rate limit），直接复用缓存的响应。
+        """
+        if not cached:
+            return self.request("GET", url, **kwargs)
+
+        # 查询参数（如 ref）不同的请求分开缓存
+        key = url
+        if kwargs.get("params"):
+            key = f"{url}?{urllib.parse.urlencode(sorted(kwargs['params'].items()))}"
+        headers = self.get_headers()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+        if hit is not None and hit.headers.get("ETag"):
+            headers["If-None-Match"] = hit.headers["ETag"]
+
+        r = self.request("GET", url, headers=headers, **kwargs)
+        if r.status_code == 304 and hit is not None:
+            return hit
+        if r.status_code == 200 and r.headers.get("ETag"):
+            with self._cache_lock:
+                self._cache.pop(key, None)
+                self._cache[key] = r
+                while len(self._cache) > CACHE_MAX_ENTRIES:
+                    self._cache.pop(next(iter(self._cache)))
+        return r
+
+    def fetch_raw(
+        self,
+        path: str,
+        until: Callable[[str], bool] = None,
+        max_bytes: int = None
+    ) -> Optional[str]:
+        """
+        以原始格式（application/vnd.github.raw）流式读取文件
+
+        不经过 JSON + base64，按块下载、边下边解码：
+        - until: 提前结束条件（如 front_matter_complete / keyword_found(...)），
+          满足后立即断开连接，返回已读到的部分
+        - max_bytes: 读取上限，默认 max_file_size；超过时放弃并返回 None
+
+        Returns:
+            文件内容（until 满足时为开头部分），不存在或超限返回 None；
+            网络错误抛出 RequestException
+        """
+        max_bytes = max_bytes or self.max_file_size
+        headers = self.get_headers()
+        headers["Accept"] = "application/vnd.github.raw"
+        name = path.rsplit("/", 1)[-1]
+
+        r = self.request("GET", self.contents_url(path), headers=headers,
+                         params={"ref": self.branch}, stream=True)
+        with r:
+            if r.status_code != 200:
+                return None
+
+            length = r.headers.get("Content-Length", "")
+            if length.isdigit() and int(length) > max_bytes and until is None:
+                print(f"⚠️ 文件超过读取上限 {max_bytes} 字节，已跳过: {name}")
+                return None
+
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            parts = []
+            received = 0
+            for chunk in r.iter_content(chunk_size=RAW_CHUNK_SIZE):
+                received += len(chunk)
+                if received > max_bytes:
+                    print(f"⚠️ 文件超过读取上限 {max_bytes} 字节，已跳过: {name}")
+                    return None
+                parts.append(decoder.decode(chunk))
+                if until is not None:
+                    text = "".join(parts)
+                    parts = [text]
+                    if until(text):
+                        return text
+            parts.append(decoder.decode(b"", final=True))
+            return "".join(parts)
+
+    # ---------- 存储后端 ----------
+    def set_backend(self, backend: StorageBackend):
+        """
+        切换存储后端
+
+        Examples:
+            client.set_backend(LocalCloneBackend("~/.aiec-hub"))   # 本地克隆
+            client.set_backend(RestBackend())                       # REST API（默认）
+        """
+        if isinstance(backend, RestBackend) and backend.client is None:
+            backend.client = self
+        self._backend = backend
+
+    def get_backend(self) -> StorageBackend:
+        """获取当前存储后端：set_backend() > 环境变量 AIEC_HUB_CLONE_DIR > REST"""
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    clone_root = os.environ.get(CLONE_DIR_ENV)
+                    if clone_root:
+                        workdir = os.path.join(clone_root, self.repo.replace("/", "__"))
+                        self._backend = LocalCloneBackend(workdir, repo=self.repo,
+                                                          branch=self.branch,
+                                                          token=self.get_token())
+                    else:
+                        self._backend = RestBackend(self)
+        return self._backend
+
+    # ---------- Push 日志 ----------
+    def push_log(
+        self,
+        content: str,
+        member_id: str = None,
+        member_name: str = None,
+        team: str = None,
+        date: str = None,
+        token: str = None,
+        structured_data: dict = None,
+        defer: bool = False
+    ) -> Dict:
+        """
+        推送日志到 GitHub
+
+        Args:
+            content: 日志正文（不含 front matter 和标题）
+            member_id: 成员 ID，默认为客户端的成员
+            member_name: 成员姓名
+            team: 团队
+            date: 日期，默认今天
+            token: GitHub token（可选，不传则用环境变量）
+            structured_data: A2A 结构化数据（可选）
+                示例: {
+                    "done": [{"content": "完成xxx", "project": "proj"}],
+                    "in_progress": [{"content": "进行中", "blockers": ["等xx"]}],
+                    "tomorrow": [{"content": "明天做"}],
+                    "ai_learning": {"topic": "xxx", "insight": "xxx"}
+                }
+            defer: 为 True 时只写入本地推送队列，稍后由 flush_spool() 批量推送
+
+        Returns:
+            {"success": True, "url": "..."} 或 {"success": False, "error": "..."}
+            推送失败（网络错误、HTTP 错误）时日志会自动写入推送队列，返回值带 "queued": True；
+            "retryable" 表示直接 flush 重试即可，否则需要先处理错误（如更换 Token）
+        """
+        if token:
+            self.set_token(token)
+
+        member_id = member_id or self.member_id
+        member_name = member_name or self.member_name
+        team = team or self.team
+
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d")
+
+        path = get_file_path(member_id, team, date)
+
+        # 生成完整内容
+        full_content = create_log_content(member_id, member_name, team, date, content, structured_data)
+
+        if defer:
+            self.spool_log(path, full_content, member_id, date)
+            print(f"📥 已加入推送队列: {date}（运行 flush 推送）")
+            return {"success": True, "queued": True, "path": path}
+
+        # 推送
+        with self._push_lock:
             try:
-                error_detail = response.json().get("message", response.text[:200])
-                error_msg += f": {error_detail}"
-            except:
-                error_msg += f": {response.text[:200]}"
-            print(f"❌ 推送失败: {error_msg}")
-            return {"success": False, "error": error_msg}
-            
-    except requests.exceptions.RequestException as e:
-        return {"success": False, "error": f"网络错误: {e}"}
+                result = self.get_backend().write(path, full_content, f"📝 [{member_id}] Sync daily log for {date}")
+            except requests.exceptions.RequestException as e:
+                self.spool_log(path, full_content, member_id, date)
+                print(f"📥 网络错误，日志已加入推送队列: {date}")
+                return {"success": False, "error": f"网络错误: {e}", "queued": True,
+                        "retryable": True}
 
-# ============ Pull 日志 ============
-def pull_log(
-    member_id: str,
-    team: str = DEFAULT_TEAM,
-    date: str = None,
-    token: str = None
-) -> Optional[str]:
-    """拉取指定日志"""
-    if token:
-        set_token(token)
-    
-    if date is None:
-        date = datetime.now().strftime("%Y-%m-%d")
-    
-    path = get_file_path(member_id, team, date)
-    encoded_path = encode_path(path)
-    url = f"{API_BASE}/repos/{REPO}/contents/{encoded_path}"
-    
-    try:
-        r = requests.get(url, headers=get_headers(), timeout=10)
-        if r.status_code == 200:
-            content = base64.b64decode(r.json()["content"]).decode("utf-8")
-            return content
-    except:
-        pass
-    return None
+            # 队列里同一路径的旧版本已过时，追加一条作废记录，flush 时不再推送
+            if result["success"] and self._spooled_paths() & {path}:
+                self._spool_entry({"path": path, "superseded": True, "member_id": member_id, "date": date})
 
-# ============ 团队日志 ============
-def pull_team_daily_logs(
-    team: str = DEFAULT_TEAM, 
-    date: str = None,
-    token: str = None
-) -> Dict[str, str]:
-    """拉取团队所有人的日志"""
-    if token:
-        set_token(token)
-    
-    if date is None:
-        date = datetime.now().strftime("%Y-%m-%d")
-    
-    team_dir = TEAM_DIRS.get(team, TEAM_DIRS["china"])
-    path = f"成员日志 members/{team_dir}"
-    encoded_path = encode_path(path)
-    url = f"{API_BASE}/repos/{REPO}/contents/{encoded_path}"
-    
-    logs = {}
-    
-    try:
-        r = requests.get(url, headers=get_headers(), timeout=10)
+        if result["success"]:
+            if result.get("committed_locally"):
+                print(f"✅ 已提交到本地克隆（运行 flush 推送）")
+            else:
+                print(f"✅ 推送成功!")
+                print(f"🔗 查看: {result.get('url', '')}")
+            return {"success": True, "url": result.get("url", "")}
+
+        # 任何失败都先落盘，不丢调用方的内容；Token 等问题修复后 flush 即可
+        print(f"❌ 推送失败: {result['error']}")
+        self.spool_log(path, full_content, member_id, date)
+        print(f"📥 日志已加入推送队列: {date}（运行 flush 重试）")
+        return {"success": False, "error": result["error"], "queued": True,
+                "retryable": bool(result.get("retryable"))}
+
+    # ---------- 离线推送队列 ----------
+    def spool_log(self, path: str, full_content: str, member_id: str = "", date: str = "") -> None:
+        """
+        把一条完整日志追加到本地推送队列（JSONL，一行一条）
+
+        写入后立即 fsync，进程崩溃或断网都不会丢日志。
+        """
+        self._spool_entry({
+            "path": path,
+            "content": full_content,
+            "member_id": member_id,
+            "date": date,
+        })
+
+    def _spool_entry(self, entry: Dict) -> None:
+        """追加一条队列记录（带仓库和分支，flush 时只推送属于本客户端的记录）"""
+        entry = {**entry, "repo": self.repo, "branch": self.branch,
+                 "queued_at": datetime.now().isoformat()}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._spool_lock:
+            with open(self.spool_file, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _read_spool(self) -> tuple:
+        """读取推送队列，返回 (entries, 已读取的字节数)"""
+        if not os.path.exists(self.spool_file):
+            return [], 0
+
+        entries = []
+        with open(self.spool_file, "rb") as f:
+            data = f.read()
+
+        # 只处理完整的行，末尾写了一半的行留给下次
+        end = data.rfind(b"\n") + 1
+        for raw in data[:end].splitlines():
+            if not raw.strip():
+                continue
+            try:
+                entries.append(json.loads(raw.decode("utf-8")))
+            except ValueError:
+                print(f"⚠️ 跳过损坏的队列记录: {raw[:80]!r}")
+        return entries, end
+
+    def _truncate_spool(self, consumed: int, keep: List[Dict] = None) -> None:
+        """删除已推送的部分，保留 keep 中的记录和 flush 期间新追加的记录"""
+        kept = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in keep or [])
+        with self._spool_lock:
+            with open(self.spool_file, "rb") as f:
+                f.seek(consumed)
+                rest = f.read()
+            tmp = self.spool_file + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(kept.encode("utf-8") + rest)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.spool_file)
+
+    def _owns(self, entry: Dict) -> bool:
+        """队列记录是否属于本客户端的仓库和分支（旧记录没有这两个字段，视为属于）"""
+        return (entry.get("repo", self.repo) == self.repo
+                and entry.get("branch", self.branch) == self.branch)
+
+    def _latest_spooled(self, entries: List[Dict]) -> Dict[str, Dict]:
+        """同一路径后写覆盖先写，已作废的路径去掉"""
+        latest = {}
+        for entry in entries:
+            if self._owns(entry):
+                latest[entry["path"]] = entry
+        return {path: e for path, e in latest.items() if not e.get("superseded")}
+
+    def _spooled_paths(self) -> set:
+        entries, _ = self._read_spool()
+        return set(self._latest_spooled(entries))
+
+    def pending_logs(self) -> List[Dict]:
+        """查看队列中待推送的日志（同一路径只保留最新版本）"""
+        entries, _ = self._read_spool()
+        return list(self._latest_spooled(entries).values())
+
+    def commit_files(self, files: Dict[str, str], message: str) -> Dict:
+        """
+        通过 Git Data API 把多个文件作为一次 commit 推送
+
+        Args:
+            files: {仓库内路径: 文件内容}
+            message: commit 信息
+
+        Returns:
+            {"success": True, "sha": "...", "url": "..."} 或 {"success": False, "error": "..."}
+        """
+        git_url = f"{API_BASE}/repos/{self.repo}/git"
+
+        r = self.request("GET", f"{git_url}/ref/heads/{self.branch}")
         if r.status_code != 200:
-            return logs
-        
-        members = [item["name"] for item in r.json() if item["type"] == "dir"]
-        
-        for member_id in members:
-            content = pull_log(member_id, team, date)
-            if content:
-                logs[member_id] = content
-        
-        print(f"📊 获取 {len(logs)}/{len(members)} 位成员的日志")
-    except:
-        pass
-    
-    return logs
+            return {"success": False, "error": f"获取分支失败: HTTP {r.status_code}"}
+        parent_sha = r.json()["object"]["sha"]
 
-# ============ 测试连接 ============
-def test_connection(token: str = None) -> Dict:
-    """测试 GitHub 连接和权限"""
-    if token:
-        set_token(token)
-    
-    try:
-        headers = get_headers()
-        
-        # 测试 token 有效性
-        r = requests.get(f"{API_BASE}/user", headers=headers, timeout=10)
+        r = self.get(f"{git_url}/commits/{parent_sha}")
         if r.status_code != 200:
-            return {"success": False, "error": f"Token 无效: HTTP {r.status_code}"}
-        
-        user = r.json().get("login", "unknown")
-        
-        # 测试仓库访问
-        r = requests.get(f"{API_BASE}/repos/{REPO}", headers=headers, timeout=10)
+            return {"success": False, "error": f"获取 commit 失败: HTTP {r.status_code}"}
+        base_tree = r.json()["tree"]["sha"]
+
+        tree = [
+            {"path": path, "mode": "100644", "type": "blob", "content": content}
+            for path, content in files.items()
+        ]
+        r = self.request("POST", f"{git_url}/trees",
+                         json={"base_tree": base_tree, "tree": tree}, timeout=60)
+        if r.status_code != 201:
+            return {"success": False, "error": f"创建 tree 失败: HTTP {r.status_code}"}
+        tree_sha = r.json()["sha"]
+
+        r = self.request("POST", f"{git_url}/commits",
+                         json={"message": message, "tree": tree_sha, "parents": [parent_sha]},
+                         timeout=30)
+        if r.status_code != 201:
+            return {"success": False, "error": f"创建 commit 失败: HTTP {r.status_code}"}
+        commit = r.json()
+
+        # 非快进（期间有人推送）时返回 422，由调用方重试
+        r = self.request("PATCH", f"{git_url}/refs/heads/{self.branch}",
+                         json={"sha": commit["sha"]}, timeout=30)
         if r.status_code != 200:
-            return {"success": False, "error": f"无法访问仓库 {REPO}"}
-        
-        return {
-            "success": True, 
-            "user": user,
-            "repo": REPO,
-            "message": f"✅ 连接成功！用户: {user}"
-        }
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+            return {"success": False, "error": f"更新分支失败: HTTP {r.status_code}"}
+
+        return {"success": True, "sha": commit["sha"], "url": commit.get("html_url", "")}
+
+    def flush_spool(self, retries: int = FLUSH_RETRIES, token: str = None) -> Dict:
+        """
+        推送队列中的所有日志
+
+        同一路径的多次修改只保留最新版本，全部合并为一次 commit；
+        失败时指数退避重试，仍失败则保留队列等待下次 flush。
+
+        Returns:
+            {"success": True, "pushed": [...路径]} 或 {"success": False, "error": "...", "pending": n}
+        """
+        if token:
+            self.set_token(token)
+
+        with self._push_lock:
+            return self._flush_spool(retries)
+
+    def _flush_spool(self, retries: int) -> Dict:
+        entries, consumed = self._read_spool()
+        # 其他仓库 / 分支的记录原样保留
+        foreign = [e for e in entries if not self._owns(e)]
+        latest = self._latest_spooled(entries)
+        if not latest:
+            if entries:
+                self._truncate_spool(consumed, keep=foreign)
+            return {"success": True, "pushed": []}
+
+        files = {path: entry["content"] for path, entry in latest.items()}
+
+        members = sorted({e.get("member_id") for e in latest.values() if e.get("member_id")})
+        message = f"📝 [{', '.join(members) or 'spool'}] Sync {len(files)} queued daily log(s)"
+
+        backend = self.get_backend()
+        result = {"success": False, "error": "未执行"}
+        for attempt in range(retries):
+            try:
+                result = backend.write_many(files, message)
+            except requests.exceptions.RequestException as e:
+                result = {"success": False, "error": f"网络错误: {e}"}
+            if result["success"]:
+                break
+            if attempt < retries - 1:
+                time.sleep(2 ** attempt)
+
+        if not result["success"]:
+            print(f"❌ 队列推送失败: {result['error']}（{len(files)} 条日志保留在队列中）")
+            return {"success": False, "error": result["error"], "pending": len(files)}
+
+        # 写入后端即视为落盘（本地克隆后端已 commit），可以清空队列
+        self._truncate_spool(consumed, keep=foreign)
+        print(f"✅ 队列推送成功: {len(files)} 条日志（合并自 {len(entries)} 次写入）")
+        return {"success": True, "pushed": sorted(files), "sha": result["sha"]}
+
+    def start_background_flusher(self, interval: float = 60.0) -> threading.Event:
+        """
+        启动后台线程定期 flush 推送队列
+
+        Returns:
+            停止信号，调用 .set() 结束后台线程
+        """
+        stop = threading.Event()
+
+        def _loop():
+            while not stop.wait(interval):
+                try:
+                    if os.path.exists(self.spool_file) and os.path.getsize(self.spool_file) > 0:
+                        self.flush_spool()
+                    self.get_backend().flush()
+                except Exception as e:
+                    print(f"⚠️ 后台 flush 出错: {e}")
+
+        threading.Thread(target=_loop, name=f"log-spool-flusher-{self.member_id}", daemon=True).start()
+        return stop
+
+    # ---------- Pull 日志 ----------
+    def pull_log(
+        self,
+        member_id: str,
+        team: str = None,
+        date: str = None,
+        token: str = None
+    ) -> Optional[str]:
+        """拉取指定日志"""
+        if token:
+            self.set_token(token)
+
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d")
+
+        path = get_file_path(member_id, team or self.team, date)
+
+        try:
+            return self.get_backend().read(path)
+        except:
+            pass
+        return None
+
+    # ---------- 团队日志 ----------
+    def pull_team_daily_logs(
+        self,
+        team: str = None,
+        date: str = None,
+        token: str = None
+    ) -> Dict[str, str]:
+        """拉取团队所有人的日志"""
+        if token:
+            self.set_token(token)
+
+        team = team or self.team
+        if date is None:
+            date = datetime.now().strftime("%Y-%m-%d")
+
+        logs = {}
+
+        try:
+            members = self.list_team_members(team)
+            by_member = self.pull_team_logs_range(team, date, date, members=members)
+            for member_id, days in by_member.items():
+                if date in days:
+                    logs[member_id] = days[date]
+
+            print(f"📊 获取 {len(logs)}/{len(members)} 位成员的日志")
+        except:
+            pass
+
+        return logs
+
+    def list_team_members(self, team: str = None) -> List[str]:
+        """列出团队成员目录名（即 member_id）"""
+        team_dir = TEAM_DIRS.get(team or self.team, TEAM_DIRS["china"])
+        path = f"成员日志 members/{team_dir}"
+        return [item["name"] for item in self.get_backend().list_dir(path) if item["type"] == "dir"]
+
+    def fetch_logs_batch(self, paths: List[str], batch_size: int = 100) -> Dict[str, str]:
+        """
+        通过 GraphQL 一次请求读取多个文件
+
+        每个路径作为一个别名字段查询，batch_size 个路径合并成一个请求；
+        不存在的文件不会出现在结果中。超过 max_file_size 的文件（按 Blob.byteSize
+        判断）以及被 GitHub 截断的内容同样跳过，与 fetch_raw 的读取上限一致。
+
+        Returns:
+            {路径: 文件内容}
+        """
+        owner, name = self.repo.split("/", 1)
+        headers = {"Authorization": f"bearer {self.get_token()}"}
+        results = {}
+
+        for start in range(0, len(paths), batch_size):
+            chunk = paths[start:start + batch_size]
+            fields = "\n".join(
+                f"f{i}: object(expression: {json.dumps(f'{self.branch}:{path}', ensure_ascii=False)}) "
+                f"{{ ... on Blob {{ byteSize isTruncated text }} }}"
+                for i, path in enumerate(chunk)
+            )
+            query = (
+                f"query {{ repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{\n"
+                f"{fields}\n}} }}"
+            )
+            r = self.request("POST", f"{API_BASE}/graphql", headers=headers,
+                             json={"query": query}, timeout=60)
+            if r.status_code != 200:
+                print(f"⚠️ 批量读取失败: HTTP {r.status_code}")
+                continue
+
+            repo_data = (r.json().get("data") or {}).get("repository") or {}
+            for i, path in enumerate(chunk):
+                blob = repo_data.get(f"f{i}")
+                if not blob or blob.get("text") is None:
+                    continue
+                if (blob.get("byteSize") or 0) > self.max_file_size or blob.get("isTruncated"):
+                    name = path.rsplit("/", 1)[-1]
+                    print(f"⚠️ 文件超过读取上限 {self.max_file_size} 字节，已跳过: {name}")
+                    continue
+                results[path] = blob["text"]
+
+        return results
+
+    def pull_team_logs_range(
+        self,
+        team: str = None,
+        date_from: str = None,
+        date_to: str = None,
+        members: List[str] = None,
+        token: str = None
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        批量拉取一段日期内团队成员的日志
+
+        REST 后端：成员列表 1 次请求 + 每 100 个文件 1 次 GraphQL 请求，
+        不再按 成员 × 天 逐个请求；本地克隆后端直接读工作区。
+
+        Args:
+            date_from / date_to: 日期范围 (YYYY-MM-DD)，包含两端，默认今天
+            members: 指定成员 ID 列表，不传则为全队
+
+        Returns:
+            {member_id: {date: 日志内容}}，没有日志的成员/日期不出现
+        """
+        if token:
+            self.set_token(token)
+
+        team = team or self.team
+        today = datetime.now().strftime("%Y-%m-%d")
+        start = datetime.strptime(date_from or today, "%Y-%m-%d")
+        end = datetime.strptime(date_to or date_from or today, "%Y-%m-%d")
+        dates = [
+            datetime.fromordinal(d).strftime("%Y-%m-%d")
+            for d in range(start.toordinal(), end.toordinal() + 1)
+        ]
+
+        if members is None:
+            members = self.list_team_members(team)
+
+        wanted = {}
+        for member_id in members:
+            for date in dates:
+                wanted[get_file_path(member_id, team, date)] = (member_id, date)
+
+        logs = {}
+        for path, content in self.get_backend().read_many(list(wanted)).items():
+            member_id, date = wanted[path]
+            logs.setdefault(member_id, {})[date] = content
+        return logs
+
+    # ---------- 测试连接 ----------
+    def test_connection(self, token: str = None) -> Dict:
+        """测试 GitHub 连接和权限"""
+        if token:
+            self.set_token(token)
+
+        try:
+            # 测试 token 有效性
+            r = self.request("GET", f"{API_BASE}/user")
+            if r.status_code != 200:
+                return {"success": False, "error": f"Token 无效: HTTP {r.status_code}"}
+
+            user = r.json().get("login", "unknown")
+
+            # 测试仓库访问
+            r = self.request("GET", f"{API_BASE}/repos/{self.repo}")
+            if r.status_code != 200:
+                return {"success": False, "error": f"无法访问仓库 {self.repo}"}
+
+            return {
+                "success": True,
+                "user": user,
+                "repo": self.repo,
+                "message": f"✅ 连接成功！用户: {user}"
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    # ---------- 团队日报搜索 ----------
+    def search_team_logs(
+        self,
+        keyword: str = None,
+        project: str = None,
+        member: str = None,
+        team: str = None,
+        date_from: str = None,
+        date_to: str = None,
+        limit: int = 10
+    ) -> List[Dict]:
+        """
+        搜索团队日报
+
+        Args:
+            keyword: 搜索关键词（在正文和 Front Matter 中搜索）
+            project: 项目名称
+            member: 成员 ID
+            team: 团队名称
+            date_from: 起始日期 (YYYY-MM-DD)
+            date_to: 结束日期 (YYYY-MM-DD)
+            limit: 返回结果数量限制
+
+        Returns:
+            匹配的日志列表，每项包含：
+            {
+                "member_id": "...",
+                "member_name": "...",
+                "date": "...",
+                "match_type": "keyword/project/...",
+                "excerpt": "...",  # 匹配片段
+                "url": "...",
+                "front_matter": {...}
+            }
+
+        Examples:
+            search_team_logs(keyword="Prompt 优化")
+            search_team_logs(project="ai-tutor")
+            search_team_logs(member="Bryce")
+        """
+        results = []
+
+        # 只需要 Front Matter 和命中处上下文，读到即可停止下载
+        until = keyword_found(keyword) if keyword else front_matter_complete
+
+        try:
+            for member_id, file_date, log_file, content in self.iter_team_logs(
+                team=team, member=member, date_from=date_from, date_to=date_to,
+                until=until
+            ):
+                result = match_log(member_id, file_date, log_file, content, keyword, project)
+                if result:
+                    results.append(result)
+                    if len(results) >= limit:
+                        return results
+
+            return results
+
+        except Exception as e:
+            print(f"搜索出错: {e}")
+            return results
+
+    def list_team_log_files(
+        self,
+        team: str = None,
+        member: str = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        列出团队成员的日志文件（只读目录，不下载内容）
+
+        Args:
+            member: 成员 ID（模糊匹配），不传则列出所有成员
+
+        Returns:
+            {member_id: [文件信息, ...]}，文件按日期倒序；
+            文件信息即 contents API 的目录项（name / path / sha / html_url / download_url）
+        """
+        team = team or self.team
+        listing = {}
+
+        # 获取团队成员列表
+        members = self.list_team_members(team)
+
+        # 如果指定了成员，只搜索该成员
+        if member:
+            members = [m for m in members if member.lower() in m.lower()]
+
+        for member_id in members:
+            listing[member_id] = self.list_member_log_files(member_id, team)
+
+        return listing
+
+    def list_member_log_files(self, member_id: str, team: str = None) -> List[Dict]:
+        """列出单个成员的日志文件，按日期倒序"""
+        team_dir = TEAM_DIRS.get(team or self.team, TEAM_DIRS["china"])
+        files = self.get_backend().list_dir(f"成员日志 members/{team_dir}/{member_id}")
+        log_files = [f for f in files if f["name"].endswith("_log.md")]
+        log_files.sort(key=lambda x: x["name"], reverse=True)
+        return log_files
+
+    def fetch_log_file(self, log_file: Dict, until: Callable[[str], bool] = None) -> Optional[str]:
+        """
+        读取 list_team_log_files() 返回的单个日志文件
+
+        until 见 fetch_raw：只需要 Front Matter / 关键词上下文时可以提前结束下载
+        """
+        try:
+            return self.get_backend().read(log_file["path"], until=until)
+        except requests.exceptions.RequestException:
+            return None
+
+    def iter_team_logs(
+        self,
+        team: str = None,
+        member: str = None,
+        date_from: str = None,
+        date_to: str = None,
+        per_member: int = 20,
+        until: Callable[[str], bool] = None
+    ):
+        """
+        遍历团队日志，逐个产出 (member_id, date, 文件信息, 内容)
+
+        Args:
+            member: 成员 ID（模糊匹配），不传则遍历所有成员
+            per_member: 每个成员最多检查最近多少个日志
+            until: 提前结束条件，见 fetch_raw；为 None 时读取全文
+        """
+        for member_id, log_files in self.list_team_log_files(team, member).items():
+            for log_file in log_files[:per_member]:
+                file_date = log_file["name"].replace("_log.md", "")
+
+                # 日期过滤
+                if date_from and file_date < date_from:
+                    continue
+                if date_to and file_date > date_to:
+                    continue
+
+                content = self.fetch_log_file(log_file, until=until)
+                if content is None:
+                    continue
+
+                yield member_id, file_date, log_file, content
+
+    def search_team_logs_batch(
+        self,
+        keywords: List[str],
+        member: str = None,
+        team: str = None,
+        date_from: str = None,
+        date_to: str = None,
+        limit: int = 50
+    ) -> List[Dict]:
+        """
+        批量关键词搜索：每篇日志只下载、扫描一次，同时匹配所有关键词
+
+        Args:
+            keywords: 关键词列表（项目名、成员 ID、技术名词等）
+            其余参数同 search_team_logs，limit 为返回的日志篇数上限
+
+        Returns:
+            命中至少一个关键词的日志列表，每项包含：
+            {
+                "member_id": "...",
+                "member_name": "...",
+                "date": "...",
+                "url": "...",
+                "hits": {"关键词": [行号, ...]},
+                "excerpts": {"关键词": "首次命中处的上下文"},
+                "front_matter": {...}
+            }
+
+        Examples:
+            search_team_logs_batch(["Remotion", "ElevenLabs", "飞书"])
+        """
+        matcher = KeywordMatcher(keywords)
+        results = []
+
+        try:
+            for member_id, file_date, log_file, content in self.iter_team_logs(
+                team=team, member=member, date_from=date_from, date_to=date_to
+            ):
+                hits = matcher.scan(content)
+                if not hits:
+                    continue
+
+                content_lines = content.split('\n')
+                line_hits = {}
+                excerpts = {}
+                for kw, positions in hits.items():
+                    line_hits[kw] = sorted({line_no for line_no, _ in positions})
+                    excerpts[kw] = excerpt_at(content_lines, line_hits[kw][0])[:300]
+
+                front_matter = parse_front_matter(content)
+                results.append({
+                    "member_id": member_id,
+                    "member_name": front_matter.get("member_name", member_id),
+                    "date": file_date,
+                    "url": log_file["html_url"],
+                    "hits": line_hits,
+                    "excerpts": excerpts,
+                    "front_matter": front_matter
+                })
+
+                if len(results) >= limit:
+                    break
+
+        except Exception as e:
+            print(f"搜索出错: {e}")
+
+        return results
 
 
 # ============ 团队日报搜索功能（新增） ============
@@ -392,9 +1272,16 @@ def parse_front_matter(content: str) -> Dict:
         front_matter = parts[1].strip()
         
         # 简单解析（不依赖 yaml 库）
+        # 支持 create_log_content() 写出的结构：
+        #   tasks_done:            → 列表，列表项可以是字典
+        #     - content: "xxx"
+        #       project: proj
+        #   ai_learning:           → 嵌套字典
+        #     topic: "xxx"
         data = {}
         current_key = None
         current_list = None
+        current_item = None
         
         for line in front_matter.split('\n'):
             line = line.rstrip()
@@ -406,9 +1293,11 @@ def parse_front_matter(content: str) -> Dict:
                 key, value = line.split(':', 1)
                 key = key.strip()
                 value = value.strip()
+                current_item = None
                 
                 if value:
-                    data[key] = value.strip('"\'')
+                    data[key] = _parse_scalar(value)
+                    current_list = None
                 else:
                     current_key = key
                     current_list = []
@@ -417,173 +1306,402 @@ def parse_front_matter(content: str) -> Dict:
             # 列表项
             elif line.startswith('  - ') and current_list is not None:
                 item = line[4:].strip()
-                current_list.append(item)
+                if _is_key_value(item):
+                    key, value = item.split(':', 1)
+                    current_item = {key.strip(): _parse_scalar(value.strip())}
+                    current_list.append(current_item)
+                else:
+                    current_item = None
+                    current_list.append(item.strip('"\''))
+            
+            # 列表项（字典）的后续字段
+            elif line.startswith('    ') and current_item is not None and _is_key_value(line.strip()):
+                key, value = line.strip().split(':', 1)
+                current_item[key.strip()] = _parse_scalar(value.strip())
+            
+            # 嵌套字典字段
+            elif line.startswith('  ') and current_key and _is_key_value(line.strip()):
+                if isinstance(data[current_key], list) and not data[current_key]:
+                    data[current_key] = {}
+                    current_list = None
+                if isinstance(data[current_key], dict):
+                    key, value = line.strip().split(':', 1)
+                    data[current_key][key.strip()] = _parse_scalar(value.strip())
         
         return data
     except:
         return {}
 
 
+def _is_key_value(text: str) -> bool:
+    """判断是否为 `key: value` 形式（排除值里恰好带冒号的普通文本）"""
+    if ':' not in text:
+        return False
+    key = text.split(':', 1)[0]
+    return bool(key) and ' ' not in key.strip() and not key.startswith(('"', "'"))
+
+
+def _parse_scalar(value: str):
+    """解析单个值：去掉引号，`[...]` 形式的行内列表解析为 list；双引号字符串还原 _yaml_str 的转义"""
+    if value.startswith('[') and value.endswith(']'):
+        try:
+            parsed = ast.literal_eval(value)
+            if isinstance(parsed, list):
+                return parsed
+        except (ValueError, SyntaxError):
+            pass
+    if len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+        return re.sub(r'\\(["\\])', r'\1', value[1:-1])
+    return value.strip('"\'')
+
+def match_log(
+    member_id: str,
+    file_date: str,
+    log_file: Dict,
+    content: str,
+    keyword: str = None,
+    project: str = None
+) -> Optional[Dict]:
+    """
+    判断单篇日志是否匹配搜索条件
+
+    Returns:
+        匹配时返回 search_team_logs 的结果项，否则返回 None
+    """
+    # 解析 Front Matter
+    front_matter = parse_front_matter(content)
+
+    # 检查是否匹配
+    match = False
+    match_type = ""
+    excerpt = ""
+
+    # 项目匹配
+    if project:
+        if any(project.lower() in str(v).lower() for v in front_matter.values()):
+            match = True
+            match_type = "project"
+            excerpt = f"项目: {project}"
+
+    # 关键词匹配
+    if keyword:
+        keyword_lower = keyword.lower()
+        if keyword_lower in content.lower():
+            match = True
+            match_type = "keyword"
+
+            # 提取匹配片段
+            content_lines = content.split('\n')
+            for i, line in enumerate(content_lines):
+                if keyword_lower in line.lower():
+                    # 提取前后各2行作为上下文
+                    excerpt = excerpt_at(content_lines, i)
+                    break
+
+    # 如果没有指定任何过滤条件，返回所有
+    if not keyword and not project:
+        match = True
+        match_type = "all"
+        # 提取 AI 学习部分作为摘要
+        ai_learning = front_matter.get("ai_learning", "")
+        if isinstance(ai_learning, dict):
+            ai_learning = " | ".join(str(v) for v in ai_learning.values() if v)
+        if ai_learning:
+            excerpt = f"AI 学习: {ai_learning}"
+
+    if not match:
+        return None
+    return {
+        "member_id": member_id,
+        "member_name": front_matter.get("member_name", member_id),
+        "date": file_date,
+        "match_type": match_type,
+        "excerpt": excerpt[:300],  # 限制长度
+        "url": log_file["html_url"],
+        "front_matter": front_matter
+    }
+
+
+# ============ 默认客户端 ============
+# 以下模块级函数保持原有调用方式，内部转发给默认客户端（成员身份和团队不传时取默认客户端的）
+_default_client = None
+_default_client_lock = threading.Lock()
+
+def get_default_client() -> HubClient:
+    """获取（首次调用时创建）默认客户端"""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = HubClient()
+    return _default_client
+
+def set_default_client(client: HubClient):
+    """替换默认客户端"""
+    global _default_client
+    _default_client = client
+
+def set_token(token: str):
+    """设置 GitHub token（供 Claude 调用）"""
+    get_default_client().set_token(token)
+
+def get_token() -> str:
+    """获取 token，优先级：set_token() > 环境变量"""
+    return get_default_client().get_token()
+
+def get_headers() -> Dict[str, str]:
+    """获取认证头"""
+    return get_default_client().get_headers()
+
+def set_backend(backend: StorageBackend):
+    """切换默认客户端的存储后端，见 HubClient.set_backend"""
+    get_default_client().set_backend(backend)
+
+def get_backend() -> StorageBackend:
+    """获取默认客户端的存储后端"""
+    return get_default_client().get_backend()
+
+def push_log(
+    content: str,
+    member_id: str = None,
+    member_name: str = None,
+    team: str = None,
+    date: str = None,
+    token: str = None,
+    structured_data: dict = None,
+    defer: bool = False
+) -> Dict:
+    """推送日志到 GitHub，参数见 HubClient.push_log"""
+    return get_default_client().push_log(
+        content, member_id=member_id, member_name=member_name, team=team, date=date,
+        token=token, structured_data=structured_data, defer=defer
+    )
+
+def spool_log(path: str, full_content: str, member_id: str = "", date: str = "") -> None:
+    """把一条完整日志追加到本地推送队列"""
+    get_default_client().spool_log(path, full_content, member_id, date)
+
+def pending_logs() -> List[Dict]:
+    """查看队列中待推送的日志（同一路径只保留最新版本）"""
+    return get_default_client().pending_logs()
+
+def commit_files(files: Dict[str, str], message: str) -> Dict:
+    """通过 Git Data API 把多个文件作为一次 commit 推送"""
+    return get_default_client().commit_files(files, message)
+
+def flush_spool(retries: int = FLUSH_RETRIES, token: str = None) -> Dict:
+    """推送队列中的所有日志，见 HubClient.flush_spool"""
+    return get_default_client().flush_spool(retries, token)
+
+def start_background_flusher(interval: float = 60.0) -> threading.Event:
+    """启动后台线程定期 flush 推送队列"""
+    return get_default_client().start_background_flusher(interval)
+
+def pull_log(
+    member_id: str,
+    team: str = None,
+    date: str = None,
+    token: str = None
+) -> Optional[str]:
+    """拉取指定日志"""
+    return get_default_client().pull_log(member_id, team, date, token)
+
+def pull_team_daily_logs(
+    team: str = None,
+    date: str = None,
+    token: str = None
+) -> Dict[str, str]:
+    """拉取团队所有人的日志"""
+    return get_default_client().pull_team_daily_logs(team, date, token)
+
+def list_team_members(team: str = None) -> List[str]:
+    """列出团队成员目录名（即 member_id）"""
+    return get_default_client().list_team_members(team)
+
+def fetch_logs_batch(paths: List[str], batch_size: int = 100) -> Dict[str, str]:
+    """通过 GraphQL 一次请求读取多个文件"""
+    return get_default_client().fetch_logs_batch(paths, batch_size)
+
+def pull_team_logs_range(
+    team: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    members: List[str] = None,
+    token: str = None
+) -> Dict[str, Dict[str, str]]:
+    """批量拉取一段日期内团队成员的日志，见 HubClient.pull_team_logs_range"""
+    return get_default_client().pull_team_logs_range(team, date_from, date_to, members, token)
+
+def test_connection(token: str = None) -> Dict:
+    """测试 GitHub 连接和权限"""
+    return get_default_client().test_connection(token)
+
 def search_team_logs(
     keyword: str = None,
     project: str = None,
     member: str = None,
-    team: str = DEFAULT_TEAM,
+    team: str = None,
     date_from: str = None,
     date_to: str = None,
     limit: int = 10
 ) -> List[Dict]:
     """
-    搜索团队日报
-    
-    Args:
-        keyword: 搜索关键词（在正文和 Front Matter 中搜索）
-        project: 项目名称
-        member: 成员 ID
-        team: 团队名称
-        date_from: 起始日期 (YYYY-MM-DD)
-        date_to: 结束日期 (YYYY-MM-DD)
-        limit: 返回结果数量限制
-    
-    Returns:
-        匹配的日志列表，每项包含：
-        {
-            "member_id": "...",
-            "member_name": "...",
-            "date": "...",
-            "match_type": "keyword/project/...",
-            "excerpt": "...",  # 匹配片段
-            "url": "...",
-            "front_matter": {...}
-        }
-    
+    搜索团队日报，参数和返回值见 HubClient.search_team_logs
+
     Examples:
         search_team_logs(keyword="Prompt 优化")
         search_team_logs(project="ai-tutor")
         search_team_logs(member="Bryce")
     """
-    results = []
-    
-    team_dir = TEAM_DIRS.get(team, TEAM_DIRS["china"])
-    members_path = f"成员日志 members/{team_dir}"
-    encoded_path = encode_path(members_path)
-    url = f"{API_BASE}/repos/{REPO}/contents/{encoded_path}"
-    
+    return get_default_client().search_team_logs(
+        keyword, project, member, team, date_from, date_to, limit
+    )
+
+def list_team_log_files(team: str = None, member: str = None) -> Dict[str, List[Dict]]:
+    """列出团队成员的日志文件（只读目录，不下载内容）"""
+    return get_default_client().list_team_log_files(team, member)
+
+def fetch_log_file(log_file: Dict, until: Callable[[str], bool] = None) -> Optional[str]:
+    """读取 list_team_log_files() 返回的单个日志文件"""
+    return get_default_client().fetch_log_file(log_file, until)
+
+def fetch_raw(path: str, until: Callable[[str], bool] = None, max_bytes: int = None) -> Optional[str]:
+    """流式读取单个文件，见 HubClient.fetch_raw"""
+    return get_default_client().fetch_raw(path, until, max_bytes)
+
+def iter_team_logs(
+    team: str = None,
+    member: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    per_member: int = 20,
+    until: Callable[[str], bool] = None
+):
+    """遍历团队日志，逐个产出 (member_id, date, 文件信息, 内容)"""
+    return get_default_client().iter_team_logs(team, member, date_from, date_to, per_member, until)
+
+def search_team_logs_batch(
+    keywords: List[str],
+    member: str = None,
+    team: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    limit: int = 50
+) -> List[Dict]:
+    """
+    批量关键词搜索，参数和返回值见 HubClient.search_team_logs_batch
+
+    Examples:
+        search_team_logs_batch(["Remotion", "ElevenLabs", "飞书"])
+    """
+    return get_default_client().search_team_logs_batch(
+        keywords, member, team, date_from, date_to, limit
+    )
+
+
+# ============ 渐进输出（asyncio） ============
+# 供命令行使用：每个成员 / 每篇日志一个请求并发执行，结果到达即输出，见 progressive.py
+def _indent(text: str, prefix: str = "   ") -> str:
+    return "\n".join(prefix + line for line in text.split("\n"))
+
+async def team_logs_progressive(
+    emit,
+    call,
+    team: str = None,
+    date: str = None,
+    client: HubClient = None
+):
+    """
+    逐个成员拉取当天日志，拉到一个输出一个
+
+    emit / call 由 progressive.run 提供；每条结果为 {"member_id", "date", "content"}
+    """
+    client = client or get_default_client()
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    members = await call(client.list_team_members, team)
+    print(f"👥 {len(members)} 位成员，正在拉取 {date} 的日志...")
+
+    async def _pull(member_id: str):
+        return member_id, await call(client.pull_log, member_id, team, date)
+
+    for next_done in asyncio.as_completed([_pull(m) for m in members]):
+        member_id, content = await next_done
+        if content is None:
+            continue
+        preview = content[:500] + "..." if len(content) > 500 else content
+        emit({"member_id": member_id, "date": date, "content": content},
+             text=f"\n{'='*50}\n👤 {member_id}\n{'='*50}\n{preview}")
+
+async def search_logs_progressive(
+    emit,
+    call,
+    keyword: str = None,
+    project: str = None,
+    member: str = None,
+    team: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    limit: int = 10,
+    per_member: int = 20,
+    client: HubClient = None
+):
+    """
+    搜索团队日报，列目录和下载日志流水线并发，命中一篇输出一篇
+
+    参数和每条结果同 search_team_logs；结果按到达顺序输出，达到 limit 后取消其余请求
+    """
+    client = client or get_default_client()
+    members = await call(client.list_team_members, team)
+    if member:
+        members = [m for m in members if member.lower() in m.lower()]
+    until = keyword_found(keyword) if keyword else front_matter_complete
+
+    async def _list(member_id: str):
+        return "list", member_id, await call(client.list_member_log_files, member_id, team)
+
+    async def _fetch(member_id: str, log_file: Dict):
+        return "log", member_id, log_file, await call(client.fetch_log_file, log_file, until)
+
+    pending = {asyncio.ensure_future(_list(m)) for m in members}
+    found = 0
     try:
-        headers = get_headers()
-        
-        # 获取团队成员列表
-        r = requests.get(url, headers=headers, timeout=10)
-        if r.status_code != 200:
-            return results
-        
-        members = [item["name"] for item in r.json() if item["type"] == "dir"]
-        
-        # 如果指定了成员，只搜索该成员
-        if member:
-            members = [m for m in members if member.lower() in m.lower()]
-        
-        # 遍历每个成员的日志
-        for member_id in members:
-            member_path = f"{members_path}/{member_id}"
-            encoded_member_path = encode_path(member_path)
-            member_url = f"{API_BASE}/repos/{REPO}/contents/{encoded_member_path}"
-            
-            r = requests.get(member_url, headers=headers, timeout=10)
-            if r.status_code != 200:
-                continue
-            
-            files = r.json()
-            
-            # 按日期排序（最新的在前）
-            log_files = [f for f in files if f["name"].endswith("_log.md")]
-            log_files.sort(key=lambda x: x["name"], reverse=True)
-            
-            # 遍历日志文件
-            for log_file in log_files[:20]:  # 每个成员最多检查最近20个日志
-                file_date = log_file["name"].replace("_log.md", "")
-                
-                # 日期过滤
-                if date_from and file_date < date_from:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                kind, member_id, *payload = task.result()
+                if kind == "list":
+                    for log_file in payload[0][:per_member]:
+                        file_date = log_file["name"].replace("_log.md", "")
+                        if (date_from and file_date < date_from) or (date_to and file_date > date_to):
+                            continue
+                        pending.add(asyncio.ensure_future(_fetch(member_id, log_file)))
                     continue
-                if date_to and file_date > date_to:
+
+                log_file, content = payload
+                if content is None:
                     continue
-                
-                # 获取文件内容
-                try:
-                    content_r = requests.get(log_file["download_url"], timeout=10)
-                    if content_r.status_code != 200:
-                        continue
-                    
-                    content = content_r.text
-                    
-                    # 解析 Front Matter
-                    front_matter = parse_front_matter(content)
-                    
-                    # 检查是否匹配
-                    match = False
-                    match_type = ""
-                    excerpt = ""
-                    
-                    # 项目匹配
-                    if project:
-                        if any(project.lower() in str(v).lower() for v in front_matter.values()):
-                            match = True
-                            match_type = "project"
-                            excerpt = f"项目: {project}"
-                    
-                    # 关键词匹配
-                    if keyword:
-                        keyword_lower = keyword.lower()
-                        if keyword_lower in content.lower():
-                            match = True
-                            match_type = "keyword"
-                            
-                            # 提取匹配片段
-                            content_lines = content.split('\n')
-                            for i, line in enumerate(content_lines):
-                                if keyword_lower in line.lower():
-                                    # 提取前后各2行作为上下文
-                                    start = max(0, i-2)
-                                    end = min(len(content_lines), i+3)
-                                    excerpt = '\n'.join(content_lines[start:end])
-                                    break
-                    
-                    # 如果没有指定任何过滤条件，返回所有
-                    if not keyword and not project:
-                        match = True
-                        match_type = "all"
-                        # 提取 AI 学习部分作为摘要
-                        ai_learning = front_matter.get("ai_learning", "")
-                        if ai_learning:
-                            excerpt = f"AI 学习: {ai_learning}"
-                    
-                    if match:
-                        results.append({
-                            "member_id": member_id,
-                            "member_name": front_matter.get("member_name", member_id),
-                            "date": file_date,
-                            "match_type": match_type,
-                            "excerpt": excerpt[:300],  # 限制长度
-                            "url": log_file["html_url"],
-                            "front_matter": front_matter
-                        })
-                        
-                        if len(results) >= limit:
-                            return results
-                
-                except Exception as e:
+                result = match_log(member_id, log_file["name"].replace("_log.md", ""),
+                                   log_file, content, keyword, project)
+                if not result:
                     continue
-        
-        return results
-    
-    except Exception as e:
-        print(f"搜索出错: {e}")
-        return results
+                emit(result, text=(
+                    f"\n📋 {result['member_name']} ({result['date']}) [{result['match_type']}]\n"
+                    f"{_indent(result['excerpt'])}\n   🔗 {result['url']}"
+                ))
+                found += 1
+                if found >= limit:
+                    return
+    finally:
+        for task in pending:
+            task.cancel()
 
 
 if __name__ == "__main__":
     import sys
+
+    # --json: team / search 的结果按 JSON Lines 逐条输出
+    as_json = "--json" in sys.argv
+    sys.argv = [a for a in sys.argv if a != "--json"]
     
     if len(sys.argv) < 2:
         print("""
@@ -593,7 +1711,11 @@ if __name__ == "__main__":
   python github_sync.py test              # 测试连接
   python github_sync.py push "日志内容"    # 推送日志
   python github_sync.py pull [member_id]  # 拉取日志
-  python github_sync.py team [date]       # 团队日志
+  python github_sync.py team [date]       # 团队日志（拉到一个输出一个）
+  python github_sync.py search [关键词] [--project X] [--member ID] [--from 日期] [--to 日期] [--limit N]
+                                          # 搜索团队日报（命中一篇输出一篇）
+  team / search 加 --json 时每条结果输出一行 JSON，Ctrl-C 中断时保留已输出的结果
+  python github_sync.py flush             # 推送离线队列（本地克隆后端同时 git push）
         """)
         sys.exit(1)
     
@@ -607,8 +1729,21 @@ if __name__ == "__main__":
         content = sys.argv[2].replace("\\n", "\n")
         push_log(content)
     
+    elif cmd == "flush":
+        pending = pending_logs()
+        if not pending:
+            print("✅ 推送队列为空")
+        else:
+            print(f"📤 推送队列中有 {len(pending)} 条日志")
+            flush_spool()
+        result = get_backend().flush()
+        if result.get("pushed"):
+            print(f"✅ git push 完成: {result['pushed']} 个本地提交")
+        elif not result["success"]:
+            print(f"❌ git push 失败: {result['error']}")
+    
     elif cmd == "pull":
-        member_id = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_MEMBER_ID
+        member_id = sys.argv[2] if len(sys.argv) > 2 else get_default_client().member_id
         content = pull_log(member_id)
         if content:
             print(content)
@@ -617,7 +1752,32 @@ if __name__ == "__main__":
     
     elif cmd == "team":
         date = sys.argv[2] if len(sys.argv) > 2 else None
-        logs = pull_team_daily_logs(date=date)
-        for member, content in logs.items():
-            print(f"\n{'='*50}\n👤 {member}\n{'='*50}")
-            print(content[:500] + "..." if len(content) > 500 else content)
+        logs = progressive.run(
+            lambda emit, call: team_logs_progressive(emit, call, date=date),
+            as_json=as_json
+        )
+        if not as_json:
+            print(f"\n📊 获取 {len(logs)} 位成员的日志")
+    
+    elif cmd == "search":
+        args = sys.argv[2:]
+        options = {"--project": None, "--member": None, "--team": None,
+                   "--from": None, "--to": None, "--limit": "10"}
+        keyword = None
+        while args:
+            arg = args.pop(0)
+            if arg in options and args:
+                options[arg] = args.pop(0)
+            else:
+                keyword = arg
+        results = progressive.run(
+            lambda emit, call: search_logs_progressive(
+                emit, call, keyword=keyword, project=options["--project"],
+                member=options["--member"], team=options["--team"],
+                date_from=options["--from"], date_to=options["--to"],
+                limit=int(options["--limit"])
+            ),
+            as_json=as_json
+        )
+        if not as_json:
+            print(f"\n🔎 共 {len(results)} 条结果")
@@ -6,61 +6,81 @@ GitHub Issue 监听与自动回复工具
 1. 检查是否有新的 Issue 提问（针对 kkkaka-oss）
 2. 检查是否有新的评论回复
 3. 自动生成回复并发送
+
+所有函数都接受可选的 client（github_sync.HubClient），
+不传时使用默认客户端（成员 kkkaka-oss）；不同成员的处理状态分别保存。
 """
 
 import sys
 sys.stdout.reconfigure(encoding='utf-8')
 
-import requests
 import os
 import json
+import asyncio
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 
+try:
+    from .github_sync import HubClient, API_BASE, REPO, get_default_client
+    from . import progressive
+except ImportError:
+    from github_sync import HubClient, API_BASE, REPO, get_default_client
+    import progressive
+
 # ============ 配置 ============
-REPO = "AIEC-Team/AIEC-agent-hub"
-API_BASE = "https://api.github.com"
 MEMBER_ID = "kkkaka-oss"
 MEMBER_NAME = "贡嘉荷"
 
-# 状态文件，记录已处理的 Issue/评论
+# 状态文件，记录已处理的 Issue/评论（默认成员用这个文件，其他成员各自一个）
 STATE_FILE = os.path.join(os.path.dirname(__file__), ".issue_state.json")
+_state_lock = threading.Lock()
 
 # ============ Token 管理 ============
-def get_token() -> str:
-    for var in ["GITHUB_PAT_TEAM_HUB", "GITHUB_TOKEN", "GH_TOKEN"]:
-        token = os.environ.get(var)
-        if token:
-            return token
-    raise EnvironmentError("❌ 未找到 GitHub Token")
-
-def get_headers() -> Dict[str, str]:
-    return {
-        "Authorization": f"token {get_token()}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+def _client(client: Optional[HubClient]) -> HubClient:
+    return client or get_default_client()
+
+def get_token(client: HubClient = None) -> str:
+    return _client(client).get_token()
+
+def get_headers(client: HubClient = None) -> Dict[str, str]:
+    return _client(client).get_headers()
 
 # ============ 状态管理 ============
-def load_state() -> Dict:
+def state_file_for(member_id: str, repo: str = REPO) -> str:
+    """成员 + 仓库对应的状态文件"""
+    if member_id == MEMBER_ID and repo == REPO:
+        return STATE_FILE
+    return os.path.join(os.path.dirname(STATE_FILE),
+                        f".issue_state.{repo.replace('/', '__')}.{member_id}.json")
+
+def load_state(client: HubClient = None) -> Dict:
     """加载已处理的状态"""
-    if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+    client = _client(client)
+    state_file = state_file_for(client.member_id, client.repo)
+    if os.path.exists(state_file):
+        with open(state_file, 'r', encoding='utf-8') as f:
             return json.load(f)
     return {"replied_issues": [], "replied_comments": [], "last_check": None}
 
-def save_state(state: Dict):
+def save_state(state: Dict, client: HubClient = None):
     """保存状态"""
-    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+    client = _client(client)
+    state_file = state_file_for(client.member_id, client.repo)
+    tmp = state_file + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
         json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, state_file)
 
 # ============ Issue 检查 ============
-def get_issues_for_member(member_id: str = MEMBER_ID) -> List[Dict]:
-    """获取针对指定成员的 Issues"""
-    headers = get_headers()
+def get_issues_for_member(member_id: str = None, client: HubClient = None) -> List[Dict]:
+    """获取针对指定成员的 Issues（默认为客户端的成员）"""
+    client = _client(client)
+    member_id = member_id or client.member_id
     
     # 搜索标题或内容中包含成员 ID 的 Issues
-    url = f"{API_BASE}/repos/{REPO}/issues?state=open&per_page=50"
-    r = requests.get(url, headers=headers, timeout=10)
+    url = f"{API_BASE}/repos/{client.repo}/issues?state=open&per_page=50"
+    r = client.get(url)
     
     if r.status_code != 200:
         print(f"❌ 获取 Issues 失败: {r.status_code}")
@@ -79,93 +99,111 @@ def get_issues_for_member(member_id: str = MEMBER_ID) -> List[Dict]:
     
     return member_issues
 
-def get_issue_comments(issue_number: int) -> List[Dict]:
+def get_issue_comments(issue_number: int, client: HubClient = None) -> List[Dict]:
     """获取 Issue 的所有评论"""
-    headers = get_headers()
-    url = f"{API_BASE}/repos/{REPO}/issues/{issue_number}/comments"
-    r = requests.get(url, headers=headers, timeout=10)
+    client = _client(client)
+    url = f"{API_BASE}/repos/{client.repo}/issues/{issue_number}/comments"
+    r = client.get(url)
     
     if r.status_code == 200:
         return r.json()
     return []
 
-def check_new_questions() -> List[Dict]:
+def check_new_questions(client: HubClient = None) -> List[Dict]:
     """检查是否有新的问题需要回复"""
-    state = load_state()
+    client = _client(client)
+    member_id = client.member_id
+    state = load_state(client)
     replied_issues = set(state.get("replied_issues", []))
     
-    issues = get_issues_for_member()
+    issues = get_issues_for_member(client=client)
     new_questions = []
     
     for issue in issues:
-        issue_num = issue['number']
-        
         # 检查是否已经回复过
-        if issue_num in replied_issues:
+        if issue['number'] in replied_issues:
             continue
         
-        # 检查评论中是否已经有 kkkaka-oss 的回复
-        comments = get_issue_comments(issue_num)
-        has_my_reply = any(
-            c['user']['login'] == MEMBER_ID for c in comments
-        )
-        
-        if not has_my_reply:
-            new_questions.append({
-                "issue_number": issue_num,
-                "title": issue['title'],
-                "body": issue.get('body', ''),
-                "author": issue['user']['login'],
-                "url": issue['html_url'],
-                "created_at": issue['created_at']
-            })
+        comments = get_issue_comments(issue['number'], client)
+        question = _new_question(issue, comments, member_id, replied_issues)
+        if question:
+            new_questions.append(question)
     
     return new_questions
 
-def check_new_replies() -> List[Dict]:
+def _new_question(issue: Dict, comments: List[Dict], member_id: str, replied_issues: set) -> Optional[Dict]:
+    """Issue 未回复过、评论中也没有该成员的回复时，返回待回复的问题"""
+    issue_num = issue['number']
+    if issue_num in replied_issues:
+        return None
+    
+    # 检查评论中是否已经有该成员的回复
+    has_my_reply = any(
+        c['user']['login'] == member_id for c in comments
+    )
+    if has_my_reply:
+        return None
+    
+    return {
+        "issue_number": issue_num,
+        "title": issue['title'],
+        "body": issue.get('body', ''),
+        "author": issue['user']['login'],
+        "url": issue['html_url'],
+        "created_at": issue['created_at']
+    }
+
+def check_new_replies(client: HubClient = None) -> List[Dict]:
     """检查是否有新的回复（别人回复了我的评论）"""
-    state = load_state()
+    client = _client(client)
+    member_id = client.member_id
+    state = load_state(client)
     replied_comments = set(state.get("replied_comments", []))
     
-    issues = get_issues_for_member()
+    issues = get_issues_for_member(client=client)
     new_replies = []
     
     for issue in issues:
-        comments = get_issue_comments(issue['number'])
-        
-        my_comment_times = []
-        for c in comments:
-            if c['user']['login'] == MEMBER_ID:
-                my_comment_times.append(c['created_at'])
-        
-        if not my_comment_times:
-            continue
-        
-        # 找出在我最后一次评论之后的其他人的评论
-        last_my_comment = max(my_comment_times)
-        
-        for c in comments:
-            if c['user']['login'] != MEMBER_ID and c['created_at'] > last_my_comment:
-                if c['id'] not in replied_comments:
-                    new_replies.append({
-                        "issue_number": issue['number'],
-                        "issue_title": issue['title'],
-                        "comment_id": c['id'],
-                        "author": c['user']['login'],
-                        "body": c['body'],
-                        "url": c['html_url'],
-                        "created_at": c['created_at']
-                    })
+        comments = get_issue_comments(issue['number'], client)
+        new_replies.extend(_new_replies(issue, comments, member_id, replied_comments))
     
     return new_replies
 
+def _new_replies(issue: Dict, comments: List[Dict], member_id: str, replied_comments: set) -> List[Dict]:
+    """找出该成员最后一次评论之后、尚未处理的其他人的评论"""
+    my_comment_times = []
+    for c in comments:
+        if c['user']['login'] == member_id:
+            my_comment_times.append(c['created_at'])
+    
+    if not my_comment_times:
+        return []
+    
+    # 找出在我最后一次评论之后的其他人的评论
+    last_my_comment = max(my_comment_times)
+    
+    new_replies = []
+    for c in comments:
+        if c['user']['login'] != member_id and c['created_at'] > last_my_comment:
+            if c['id'] not in replied_comments:
+                new_replies.append({
+                    "issue_number": issue['number'],
+                    "issue_title": issue['title'],
+                    "comment_id": c['id'],
+                    "author": c['user']['login'],
+                    "body": c['body'],
+                    "url": c['html_url'],
+                    "created_at": c['created_at']
+                })
+    return new_replies
+
 # ============ 回复功能 ============
-def post_comment(issue_number: int, body: str) -> Dict:
+def post_comment(issue_number: int, body: str, client: HubClient = None) -> Dict:
     """发送评论到 Issue"""
-    headers = get_headers()
-    url = f"{API_BASE}/repos/{REPO}/issues/{issue_number}/comments"
+    client = _client(client)
+    url = f"{API_BASE}/repos/{client.repo}/issues/{issue_number}/comments"
     
-    r = requests.post(url, headers=headers, json={"body": body}, timeout=30)
+    r = client.request("POST", url, json={"body": body}, timeout=30)
     
     if r.status_code == 201:
         result = r.json()
@@ -177,24 +215,26 @@ def post_comment(issue_number: int, body: str) -> Dict:
         print(r.text)
         return {"success": False, "error": r.text}
 
-def mark_issue_replied(issue_number: int):
+def mark_issue_replied(issue_number: int, client: HubClient = None):
     """标记 Issue 已回复"""
-    state = load_state()
-    if issue_number not in state["replied_issues"]:
-        state["replied_issues"].append(issue_number)
-    state["last_check"] = datetime.now().isoformat()
-    save_state(state)
+    with _state_lock:
+        state = load_state(client)
+        if issue_number not in state["replied_issues"]:
+            state["replied_issues"].append(issue_number)
+        state["last_check"] = datetime.now().isoformat()
+        save_state(state, client)
 
-def mark_comment_replied(comment_id: int):
+def mark_comment_replied(comment_id: int, client: HubClient = None):
     """标记评论已处理"""
-    state = load_state()
-    if comment_id not in state["replied_comments"]:
-        state["replied_comments"].append(comment_id)
-    state["last_check"] = datetime.now().isoformat()
-    save_state(state)
+    with _state_lock:
+        state = load_state(client)
+        if comment_id not in state["replied_comments"]:
+            state["replied_comments"].append(comment_id)
+        state["last_check"] = datetime.now().isoformat()
+        save_state(state, client)
 
 # ============ 主要功能 ============
-def check_and_report() -> Dict:
+def check_and_report(client: HubClient = None) -> Dict:
     """
     检查新问题和新回复，返回需要处理的内容
     
@@ -205,28 +245,24 @@ def check_and_report() -> Dict:
         }
     """
     print("=" * 60)
-    print(f"🔍 检查 GitHub Issues (成员: {MEMBER_ID})")
+    client = _client(client)
+    print(f"🔍 检查 GitHub Issues (成员: {client.member_id})")
     print("=" * 60)
     
-    new_questions = check_new_questions()
-    new_replies = check_new_replies()
+    new_questions = check_new_questions(client)
+    new_replies = check_new_replies(client)
     
     if new_questions:
         print(f"\n📬 发现 {len(new_questions)} 个新问题:")
         for q in new_questions:
-            print(f"\n  Issue #{q['issue_number']}: {q['title']}")
-            print(f"  提问者: {q['author']}")
-            print(f"  链接: {q['url']}")
-            print(f"  内容预览: {q['body'][:200]}..." if len(q['body']) > 200 else f"  内容: {q['body']}")
+            print(format_question(q))
     else:
         print("\n✅ 没有新问题")
     
     if new_replies:
         print(f"\n💬 发现 {len(new_replies)} 条新回复:")
         for r in new_replies:
-            print(f"\n  Issue #{r['issue_number']}: {r['issue_title']}")
-            print(f"  回复者: {r['author']}")
-            print(f"  内容预览: {r['body'][:200]}..." if len(r['body']) > 200 else f"  内容: {r['body']}")
+            print(format_reply(r))
     else:
         print("\n✅ 没有新回复")
     
@@ -235,20 +271,64 @@ def check_and_report() -> Dict:
         "new_replies": new_replies
     }
 
-def reply_to_issue(issue_number: int, reply_content: str) -> Dict:
+def format_question(q: Dict) -> str:
+    body = q['body'] or ''
+    return "\n".join([
+        f"\n  Issue #{q['issue_number']}: {q['title']}",
+        f"  提问者: {q['author']}",
+        f"  链接: {q['url']}",
+        f"  内容预览: {body[:200]}..." if len(body) > 200 else f"  内容: {body}",
+    ])
+
+def format_reply(r: Dict) -> str:
+    body = r['body'] or ''
+    return "\n".join([
+        f"\n  Issue #{r['issue_number']}: {r['issue_title']}",
+        f"  回复者: {r['author']}",
+        f"  内容预览: {body[:200]}..." if len(body) > 200 else f"  内容: {body}",
+    ])
+
+async def check_progressive(emit, call, client: HubClient = None):
+    """
+    check_and_report 的渐进版本：各 Issue 的评论并发获取，发现新问题 / 新回复立即输出
+
+    emit / call 由 progressive.run 提供；每条结果为带 "type": "question" / "reply" 的字典
+    """
+    client = _client(client)
+    member_id = client.member_id
+    state = load_state(client)
+    replied_issues = set(state.get("replied_issues", []))
+    replied_comments = set(state.get("replied_comments", []))
+    print(f"🔍 检查 GitHub Issues (成员: {member_id})")
+
+    issues = await call(get_issues_for_member, None, client)
+
+    async def _comments(issue: Dict):
+        return issue, await call(get_issue_comments, issue['number'], client)
+
+    for next_done in asyncio.as_completed([_comments(issue) for issue in issues]):
+        issue, comments = await next_done
+        question = _new_question(issue, comments, member_id, replied_issues)
+        if question:
+            emit({"type": "question", **question}, text="📬 新问题" + format_question(question))
+        for reply in _new_replies(issue, comments, member_id, replied_comments):
+            emit({"type": "reply", **reply}, text="💬 新回复" + format_reply(reply))
+
+def reply_to_issue(issue_number: int, reply_content: str, client: HubClient = None) -> Dict:
     """
     回复指定的 Issue
     
     Args:
         issue_number: Issue 编号
         reply_content: 回复内容
+        client: 以哪个成员的身份回复，默认客户端
     
     Returns:
         {"success": True/False, "url": "..."}
     """
-    result = post_comment(issue_number, reply_content)
+    result = post_comment(issue_number, reply_content, client)
     if result.get("success"):
-        mark_issue_replied(issue_number)
+        mark_issue_replied(issue_number, client)
     return result
 
 
@@ -260,7 +340,9 @@ if __name__ == "__main__":
 GitHub Issue 监听工具
 
 用法:
-  python issue_monitor.py check              # 检查新问题和回复
+  python issue_monitor.py check              # 检查新问题和回复（发现一条输出一条）
+  python issue_monitor.py check --json       # 每条结果输出一行 JSON
+  python issue_monitor.py check --all        # 全部检查完后汇总输出
   python issue_monitor.py reply <issue_num> "回复内容"  # 回复指定 Issue
         """)
         sys.exit(1)
@@ -268,7 +350,12 @@ GitHub Issue 监听工具
     cmd = sys.argv[1]
     
     if cmd == "check":
-        check_and_report()
+        if "--all" in sys.argv:
+            check_and_report()
+        else:
+            found = progressive.run(check_progressive, as_json="--json" in sys.argv)
+            if "--json" not in sys.argv and not found:
+                print("✅ 没有新问题和新回复")
     
     elif cmd == "reply" and len(sys.argv) >= 4:
         issue_num = int(sys.argv[2])
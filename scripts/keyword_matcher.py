@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+多关键词匹配器（Aho-Corasick 自动机）
+
+一次扫描文档即可找出所有关键词的命中位置，供批量检索使用：
+问十个关键词只需扫一遍日志，而不是十遍。
+"""
+
+from collections import deque
+from typing import Dict, List, Tuple
+
+
+def _fold(text: str) -> str:
+    """
+    逐字符转小写，每个字符只保留小写结果的第一个字符
+
+    个别字符小写后会变长（如 "İ" → "i̇"），这样处理后文本长度不变，
+    命中位置可以直接对应原文；关键词和文本用同一规则，保证能互相匹配。
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(ch.lower()[:1] or ch for ch in text)
+
+
+class KeywordMatcher:
+    """
+    编译好的多关键词自动机（大小写不敏感）
+
+    示例:
+        matcher = KeywordMatcher(["Remotion", "ElevenLabs", "FFmpeg"])
+        hits = matcher.scan(content)
+        # {"Remotion": [(12, 340), ...], "FFmpeg": [(3, 88)]}
+        # 每个命中为 (行号, 字符偏移)，行号从 0 开始
+    """
+
+    def __init__(self, keywords: List[str]):
+        # 去重并保持原始顺序，空关键词忽略
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for idx, keyword in enumerate(self.keywords):
+            self._add(_fold(keyword), idx)
+        self._build()
+
+    def _add(self, word: str, idx: int):
+        state = 0
+        for ch in word:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state].append(idx)
+
+    def _build(self):
+        """BFS 计算失配指针，并把后缀状态的输出合并进来"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        扫描文本，返回每个命中关键词的位置
+
+        Returns:
+            {关键词: [(行号, 起始字符偏移), ...]}，未命中的关键词不出现
+        """
+        hits: Dict[str, List[Tuple[int, int]]] = {}
+        if not self.keywords:
+            return hits
+
+        lowered = _fold(text)
+
+        goto, fail, out = self._goto, self._fail, self._out
+        lengths = [len(_fold(k)) for k in self.keywords]
+        state = 0
+        line_no = 0
+        for pos, ch in enumerate(lowered):
+            if ch == "\n":
+                line_no += 1
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in out[state]:
+                keyword = self.keywords[idx]
+                start = pos - lengths[idx] + 1
+                # 关键词本身跨行时，行号取起始行
+                hit_line = line_no - lowered.count("\n", start, pos + 1) if "\n" in keyword else line_no
+                hits.setdefault(keyword, []).append((hit_line, start))
+        return hits
+
+
+def excerpt_at(lines: List[str], line_no: int, context: int = 2) -> str:
+    """提取第 line_no 行前后各 context 行作为上下文片段"""
+    start = max(0, line_no - context)
+    end = min(len(lines), line_no + context + 1)
+    return "\n".join(lines[start:end])
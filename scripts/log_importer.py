@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+本地 Markdown 日志批量导入
+
+把 daily-logs/ 这类自由格式的 Markdown 笔记（没有 A2A Front Matter）转换为 Hub 日志：
+- 日期取自文件名（2026-03-09-xxx.md），没有则从标题 / 开头几行识别（2026年3月9日、2026.03.09 ...）
+- 按标题关键词把章节归入 done / in_progress / tomorrow，生成结构化数据
+- 通过 create_log_content 渲染完整日志
+
+文件在进程池中并行解析，结果写入推送队列后一次 flush（一次 commit）。
+Hub 上已有的同日日志默认跳过，避免覆盖。
+
+用法:
+    python log_importer.py daily-logs [--member ID] [--name 姓名] [--team china]
+                                      [--dry-run] [--overwrite] [--workers N]
+"""
+
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import os
+import re
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, List
+
+try:
+    from . import github_sync
+except ImportError:
+    import github_sync
+
+# ============ 配置 ============
+# 标题关键词 → 分类（按顺序匹配，先命中先用）
+SECTION_KEYWORDS = [
+    ("tomorrow", ["明日", "明天", "后续", "下一步", "计划", "待办", "优化方向",
+                  "tomorrow", "next", "todo", "plan"]),
+    ("in_progress", ["进行中", "进行", "未完成", "阻塞", "卡点",
+                     "in progress", "wip", "ongoing", "blocker"]),
+    ("done", ["完成", "成果", "交付", "产出", "进展", "攻克",
+              "done", "completed", "achievement", "deliverable"]),
+]
+
+# 少于这个数量的文件直接在当前进程处理，不值得启动进程池
+POOL_MIN_FILES = 4
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)(?:[-*+]|\d+[.)])\s+(?:\[([ xX])\]\s+)?(.*)$")
+_FILENAME_DATE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_TEXT_DATES = [
+    re.compile(r"(\d{4})\s*年\s*(\d{1,2})\s*月\s*(\d{1,2})\s*日"),
+    re.compile(r"(\d{4})[-./](\d{1,2})[-./](\d{1,2})"),
+]
+# 标题编号（"一、" "1.1" "2)"）和 Markdown 强调
+_NUMBERING = re.compile(r"^(?:[一二三四五六七八九十]+、|\d+(?:\.\d+)*(?:[.)、]|\s))\s*")
+_EMPHASIS = re.compile(r"(\*\*|__|`)")
+
+
+# ============ 解析 ============
+def extract_date(filename: str, text: str, head_lines: int = 20) -> Optional[str]:
+    """
+    识别日志日期：先看文件名，再看标题和开头几行
+
+    Returns:
+        "YYYY-MM-DD"，识别不到返回 None
+    """
+    candidates = [(_FILENAME_DATE, os.path.basename(filename))]
+    head = "\n".join(text.split("\n")[:head_lines])
+    candidates += [(pattern, head) for pattern in _TEXT_DATES]
+
+    for pattern, source in candidates:
+        m = pattern.search(source)
+        if not m:
+            continue
+        year, month, day = (int(g) for g in m.groups())
+        if 1 <= month <= 12 and 1 <= day <= 31:
+            return f"{year:04d}-{month:02d}-{day:02d}"
+    return None
+
+def classify_heading(title: str) -> Optional[str]:
+    """按关键词把章节标题归类为 done / in_progress / tomorrow，无法归类返回 None"""
+    title = title.lower()
+    for category, keywords in SECTION_KEYWORDS:
+        if any(k in title for k in keywords):
+            return category
+    return None
+
+def _clean(text: str) -> str:
+    return _EMPHASIS.sub("", text).strip()
+
+def extract_tasks(text: str) -> Dict[str, List[str]]:
+    """
+    从 Markdown 中提取任务
+
+    规则：
+    - 勾选框 "- [x]" 一律为 done；"- [ ]" 归入所在章节的分类（done 章节或未分类时为 tomorrow）
+    - 已分类章节的子标题作为一条任务（子章节里有勾选框时改用勾选项，不再细分更深的标题）
+    - 已分类章节下直接列出的顶层列表项作为任务
+
+    Returns:
+        {"done": [...], "in_progress": [...], "tomorrow": [...]}
+    """
+    tasks = {"done": [], "in_progress": [], "tomorrow": []}
+    stack = []          # [(层级, 分类)]
+    subsection = None   # 已分类章节下的当前子章节: {"title", "level", "category", "has_checkbox"}
+
+    def _close_subsection():
+        if subsection and not subsection["has_checkbox"]:
+            tasks[subsection["category"]].append(subsection["title"])
+
+    for line in text.split("\n"):
+        heading = _HEADING.match(line)
+        if heading:
+            level, title = len(heading.group(1)), _clean(_NUMBERING.sub("", heading.group(2)))
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            # 子章节里更深的标题只是细节
+            if subsection and level > subsection["level"]:
+                stack.append((level, None))
+                continue
+            parent = next((c for _, c in reversed(stack) if c), None)
+            category = classify_heading(title)
+            stack.append((level, category))
+
+            _close_subsection()
+            subsection = None
+            # 已分类章节下的子标题本身就是一条任务（子标题自己能分类时用自己的分类）
+            if parent and title:
+                subsection = {"title": title, "level": level,
+                              "category": category or parent, "has_checkbox": False}
+            continue
+
+        item = _LIST_ITEM.match(line)
+        if not item:
+            continue
+        indent, checkbox, content = item.groups()
+        content = _clean(content)
+        if not content:
+            continue
+        section = next((c for _, c in reversed(stack) if c), None)
+
+        if checkbox is not None:
+            if subsection:
+                subsection["has_checkbox"] = True
+            if checkbox.lower() == "x":
+                tasks["done"].append(content)
+            else:
+                tasks[section if section in ("in_progress", "tomorrow") else "tomorrow"].append(content)
+        elif section and not subsection and not indent:
+            tasks[section].append(content)
+
+    _close_subsection()
+    return {k: list(dict.fromkeys(v)) for k, v in tasks.items()}
+
+def project_from_filename(filename: str) -> Optional[str]:
+    """文件名去掉日期后的部分作为项目名（2026-03-09-ai-voice-video-pipeline.md → ai-voice-video-pipeline）"""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    slug = _FILENAME_DATE.sub("", stem).strip("-_ ")
+    return slug or None
+
+def build_structured_data(tasks: Dict[str, List[str]], project: str = None) -> Dict:
+    """把提取到的任务转换为 push_log / create_log_content 的 structured_data"""
+    return {
+        "done": [{"content": t, **({"project": project} if project else {})} for t in tasks["done"]],
+        "in_progress": [{"content": t} for t in tasks["in_progress"]],
+        "tomorrow": [{"content": t} for t in tasks["tomorrow"]],
+    }
+
+
+# ============ 转换 ============
+def convert_file(path: str, member_id: str, member_name: str, team: str) -> Dict:
+    """
+    转换单个文件（在子进程中执行）
+
+    Returns:
+        {"source", "date", "path", "body", "structured_data", "content"}；
+        失败时为 {"source", "error"}
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            body = f.read().strip()
+    except (OSError, UnicodeDecodeError) as e:
+        return {"source": path, "error": str(e)}
+
+    date = extract_date(path, body)
+    if not date:
+        return {"source": path, "error": "无法识别日期"}
+
+    structured = build_structured_data(extract_tasks(body), project_from_filename(path))
+    return {
+        "source": path,
+        "date": date,
+        "path": github_sync.get_file_path(member_id, team, date),
+        "body": body,
+        "structured_data": structured,
+        "content": github_sync.create_log_content(member_id, member_name, team, date,
+                                                  body, structured),
+    }
+
+def _merge_same_day(converted: List[Dict], member_id: str, member_name: str, team: str) -> Dict[str, Dict]:
+    """同一天的多个文件合并为一篇日志"""
+    by_path = {}
+    for item in converted:
+        by_path.setdefault(item["path"], []).append(item)
+
+    merged = {}
+    for path, items in by_path.items():
+        if len(items) == 1:
+            merged[path] = items[0]
+            continue
+        structured = {key: [t for i in items for t in i["structured_data"][key]]
+                      for key in ("done", "in_progress", "tomorrow")}
+        body = "\n\n---\n\n".join(i["body"] for i in items)
+        date = items[0]["date"]
+        merged[path] = {
+            "source": ", ".join(i["source"] for i in items),
+            "date": date,
+            "path": path,
+            "body": body,
+            "structured_data": structured,
+            "content": github_sync.create_log_content(member_id, member_name, team, date,
+                                                      body, structured),
+        }
+    return merged
+
+
+# ============ 主要功能 ============
+def import_logs(
+    directory: str,
+    member_id: str = None,
+    member_name: str = None,
+    team: str = None,
+    overwrite: bool = False,
+    dry_run: bool = False,
+    workers: int = None,
+    client: github_sync.HubClient = None
+) -> Dict:
+    """
+    批量导入目录下的 Markdown 日志
+
+    Args:
+        directory: 本地目录，读取其中的 *.md
+        member_id / member_name / team: 成员身份，默认取 client
+        overwrite: Hub 上已有同日日志时是否覆盖
+        dry_run: 只解析不推送
+        workers: 进程数，默认 CPU 核数
+        client: HubClient，不传时使用默认客户端
+
+    Returns:
+        {"success": True, "imported": [日期...], "skipped": [日期...], "failed": [{"source", "error"}]}
+        推送失败时 success 为 False，日志保留在推送队列中
+    """
+    client = client or github_sync.get_default_client()
+    member_id = member_id or client.member_id
+    member_name = member_name or client.member_name
+    team = team or client.team
+    # 在启动进程池前校验，否则每个子进程里 get_file_path 都会抛 ValueError 并中断整个池
+    if team not in github_sync.TEAM_DIRS:
+        return {"success": False,
+                "error": f"❌ 无效团队: {team}，可选: {list(github_sync.TEAM_DIRS.keys())}"}
+
+    files = sorted(glob.glob(os.path.join(directory, "*.md")))
+    if not files:
+        return {"success": False, "error": f"目录中没有 Markdown 文件: {directory}"}
+
+    args = (files, [member_id] * len(files), [member_name] * len(files), [team] * len(files))
+    if len(files) < POOL_MIN_FILES:
+        results = list(map(convert_file, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(convert_file, *args, chunksize=8))
+
+    failed = [r for r in results if "error" in r]
+    for r in failed:
+        print(f"⚠️ 跳过 {os.path.basename(r['source'])}: {r['error']}")
+    logs = _merge_same_day([r for r in results if "error" not in r], member_id, member_name, team)
+
+    skipped = []
+    if not overwrite and logs:
+        existing = {f["path"] for f in client.list_member_log_files(member_id, team)}
+        skipped = sorted(logs[p]["date"] for p in logs if p in existing)
+        logs = {p: log for p, log in logs.items() if p not in existing}
+        if skipped:
+            print(f"⏭️ Hub 上已有 {len(skipped)} 篇同日日志，已跳过（--overwrite 覆盖）")
+
+    imported = sorted(log["date"] for log in logs.values())
+    for log in sorted(logs.values(), key=lambda x: x["date"]):
+        s = log["structured_data"]
+        print(f"📄 {log['date']}  完成 {len(s['done'])} / 进行中 {len(s['in_progress'])} / "
+              f"明日 {len(s['tomorrow'])}  ← {os.path.basename(log['source'])}")
+
+    summary = {"imported": imported, "skipped": skipped, "failed": failed}
+    if dry_run or not logs:
+        return {"success": True, **summary}
+
+    for log in logs.values():
+        client.spool_log(log["path"], log["content"], member_id, log["date"])
+    result = client.flush_spool()
+    if not result["success"]:
+        return {"success": False, "error": result["error"], **summary}
+    return {"success": True, **summary}
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0].startswith("--"):
+        print("""
+本地 Markdown 日志批量导入
+
+用法:
+  python log_importer.py <目录> [--member ID] [--name 姓名] [--team china]
+                                [--dry-run] [--overwrite] [--workers N]
+        """)
+        sys.exit(1)
+
+    directory = args.pop(0)
+    options = {"--member": None, "--name": None, "--team": None, "--workers": None}
+    flags = {"--dry-run": False, "--overwrite": False}
+    while args:
+        arg = args.pop(0)
+        if arg in flags:
+            flags[arg] = True
+        elif arg in options and args:
+            options[arg] = args.pop(0)
+
+    result = import_logs(
+        directory,
+        member_id=options["--member"],
+        member_name=options["--name"],
+        team=options["--team"],
+        overwrite=flags["--overwrite"],
+        dry_run=flags["--dry-run"],
+        workers=int(options["--workers"]) if options["--workers"] else None,
+    )
+    if not result["success"]:
+        print(f"❌ {result['error']}")
+    else:
+        action = "解析" if flags["--dry-run"] else "导入"
+        print(f"\n✅ {action} {len(result['imported'])} 篇，跳过 {len(result['skipped'])} 篇，"
+              f"失败 {len(result['failed'])} 篇")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+命令行渐进输出（asyncio）
+
+team / search / check 等命令需要发出很多独立请求。这里把阻塞的请求放到线程里并发执行
+（专用线程池 + 信号量限制并发），每得到一个结果就立即输出，而不是全部完成后才打印：
+- 第一个结果只需一次往返
+- Ctrl-C 中断时保留已输出的结果，并在 stderr 提示完成进度
+- main 返回（如搜索达到 limit）或中断后立即关闭线程池、丢弃排队的调用，不等进行中的请求
+- --json 模式每个结果输出一行 JSON（JSON Lines），其他提示信息都转到 stderr，方便管道交给其他 Agent
+
+用法:
+    async def main(emit, call):
+        for r in asyncio.as_completed([call(fetch, x) for x in items]):
+            emit(await r, text="...")
+
+    results = run(main, as_json="--json" in sys.argv)
+"""
+
+import sys
+import json
+import asyncio
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict
+
+DEFAULT_CONCURRENCY = 8
+
+
+def bounded(executor: ThreadPoolExecutor, concurrency: int = DEFAULT_CONCURRENCY) -> Callable:
+    """
+    返回 call(fn, *args, **kwargs)：在 executor 中执行阻塞函数，同时最多 concurrency 个
+
+    必须在事件循环内调用（信号量绑定当前循环）。不用 asyncio.to_thread：默认线程池在
+    asyncio.run 结束时会等待所有进行中的调用，中断或提前结束时要多等一轮请求。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(fn: Callable, *args, **kwargs):
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    return call
+
+
+def run(main: Callable, as_json: bool = False, concurrency: int = DEFAULT_CONCURRENCY) -> List[Dict]:
+    """
+    运行 main(emit, call) 并渐进输出结果
+
+    Args:
+        main: async 函数，参数为 emit(record, text=None) 和 call（见 bounded）
+        as_json: True 时每条 record 输出一行 JSON，否则输出 text（默认为 record 的 JSON）
+        concurrency: 同时进行的阻塞调用数上限
+
+    Returns:
+        已输出的全部 record（中断时为中断前的部分）
+    """
+    results = []
+    out = sys.stdout
+
+    def emit(record: Dict, text: str = None):
+        results.append(record)
+        if as_json:
+            out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        else:
+            out.write((text if text is not None else json.dumps(record, ensure_ascii=False)) + "\n")
+        out.flush()
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="progressive")
+
+    async def _main():
+        try:
+            await main(emit, bounded(executor, concurrency))
+        finally:
+            # 结果已经够了（或被取消），不再等待进行中的请求
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # JSON 模式下 stdout 只留给结果，其余 print 都转到 stderr
+    redirect = contextlib.redirect_stdout(sys.stderr) if as_json else contextlib.nullcontext()
+    with redirect:
+        try:
+            asyncio.run(_main())
+        except KeyboardInterrupt:
+            print(f"\n⏹️ 已中断，保留已获取的 {len(results)} 条结果", file=sys.stderr)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return results
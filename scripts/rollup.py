@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+周报 / 月报汇总
+
+一次批量拉取日期范围内的日志（pull_team_logs_range），然后在本地汇总：
+- 已完成任务按项目归类
+- 进行中的任务延续到期末（后来完成的自动移除）
+- blocker 区分已解除 / 仍未解除
+
+同时输出结构化数据和 Markdown。
+
+用法:
+    python rollup.py week [截止日期] [--member ID] [--team china] [--json]
+    python rollup.py month [截止日期] [--member ID] [--team china] [--json]
+"""
+
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+try:
+    from . import github_sync
+except ImportError:
+    import github_sync
+
+NO_PROJECT = "其他"
+
+
+# ============ 日期范围 ============
+def period_range(period: str = "week", end: str = None) -> Tuple[str, str]:
+    """
+    计算汇总的日期范围
+
+    Args:
+        period: "week"（截止日所在周的周一起）或 "month"（截止日所在月的 1 号起）
+        end: 截止日期 (YYYY-MM-DD)，默认今天
+
+    Returns:
+        (date_from, date_to)
+    """
+    end_dt = datetime.strptime(end, "%Y-%m-%d") if end else datetime.now()
+    if period == "week":
+        start_dt = end_dt - timedelta(days=end_dt.weekday())
+    elif period == "month":
+        start_dt = end_dt.replace(day=1)
+    else:
+        raise ValueError(f"❌ 无效周期: {period}，可选: week / month")
+    return start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d")
+
+
+# ============ 汇总 ============
+def _content(task) -> str:
+    if isinstance(task, dict):
+        return str(task.get("content", "")).strip()
+    return str(task).strip()
+
+def build_rollup(logs: Dict[str, Dict[str, str]], date_from: str, date_to: str) -> Dict:
+    """
+    汇总多位成员、多天的日志
+
+    Args:
+        logs: {member_id: {date: 日志内容}}，即 pull_team_logs_range() 的返回值
+
+    Returns:
+        {
+            "date_from": "...", "date_to": "...",
+            "members": {member_id: {"member_name": "...", "days_logged": 3}},
+            "done_by_project": {项目: [{"content", "member_id", "date"}]},
+            "in_progress": [{"content", "member_id", "since", "last_seen", "blockers"}],
+            "blockers": {"open": [{"blocker", "member_id", "since"}],
+                         "resolved": [{"blocker", "member_id", "since", "last_seen"}]}
+        }
+    """
+    members = {}
+    done_by_project: Dict[str, List[Dict]] = {}
+    in_progress = []
+    open_blockers = []
+    resolved_blockers = []
+
+    for member_id in sorted(logs):
+        days = sorted(logs[member_id].items())
+        member_name = member_id
+        done_seen = {}          # content -> 完成日期
+        progress = {}           # content -> 进行中条目
+        blockers_seen = {}      # blocker -> {"since", "last_seen"}
+        latest_blockers = None  # 最后一篇日志中的 blockers
+
+        for date, content in days:
+            fm = github_sync.parse_front_matter(content)
+            member_name = fm.get("member_name") or member_name
+
+            for task in fm.get("tasks_done") or []:
+                text = _content(task)
+                if not text or text in done_seen:
+                    continue
+                done_seen[text] = date
+                project = task.get("project") if isinstance(task, dict) else None
+                done_by_project.setdefault(project or NO_PROJECT, []).append(
+                    {"content": text, "member_id": member_id, "date": date}
+                )
+
+            for task in fm.get("tasks_in_progress") or []:
+                text = _content(task)
+                if not text:
+                    continue
+                item = progress.setdefault(text, {
+                    "content": text, "member_id": member_id,
+                    "since": date, "last_seen": date, "blockers": [],
+                })
+                item["last_seen"] = date
+                if isinstance(task, dict) and isinstance(task.get("blockers"), list):
+                    item["blockers"] = task["blockers"]
+
+            blockers = fm.get("blockers")
+            if isinstance(blockers, list):
+                latest_blockers = [str(b) for b in blockers]
+                for b in latest_blockers:
+                    seen = blockers_seen.setdefault(b, {"since": date, "last_seen": date})
+                    seen["last_seen"] = date
+
+        members[member_id] = {"member_name": member_name, "days_logged": len(days)}
+
+        # 进行中任务延续到期末，之后标记完成的移除
+        for text, item in progress.items():
+            if text in done_seen and done_seen[text] >= item["last_seen"]:
+                continue
+            in_progress.append(item)
+
+        # 最后一篇日志仍列出的 blocker 为未解除，其余为已解除
+        still_open = set(latest_blockers or [])
+        for b, seen in blockers_seen.items():
+            if b in still_open:
+                open_blockers.append({"blocker": b, "member_id": member_id, "since": seen["since"]})
+            else:
+                resolved_blockers.append({"blocker": b, "member_id": member_id, **seen})
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "members": members,
+        "done_by_project": dict(sorted(done_by_project.items(),
+                                       key=lambda kv: (kv[0] == NO_PROJECT, kv[0]))),
+        "in_progress": in_progress,
+        "blockers": {"open": open_blockers, "resolved": resolved_blockers},
+    }
+
+def render_markdown(rollup: Dict) -> str:
+    """把汇总结果渲染为 Markdown"""
+    names = {m: info["member_name"] for m, info in rollup["members"].items()}
+    lines = [
+        f"# 团队汇总 | {rollup['date_from']} ~ {rollup['date_to']}",
+        "",
+        "━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
+        "",
+        "## 👥 成员",
+    ]
+    for member_id, info in rollup["members"].items():
+        lines.append(f"- {info['member_name']}: {info['days_logged']} 篇日志")
+
+    lines += ["", "## ✅ 完成"]
+    if not rollup["done_by_project"]:
+        lines.append("- 无")
+    for project, tasks in rollup["done_by_project"].items():
+        lines.append(f"### {project}")
+        for t in tasks:
+            lines.append(f"- {t['content']}（{names.get(t['member_id'], t['member_id'])}, {t['date']}）")
+
+    lines += ["", "## 🔄 进行中"]
+    if not rollup["in_progress"]:
+        lines.append("- 无")
+    for t in rollup["in_progress"]:
+        lines.append(f"- {t['content']}（{names.get(t['member_id'], t['member_id'])}, 自 {t['since']}）")
+        for b in t["blockers"]:
+            lines.append(f"  - ⚠️ blocked: {b}")
+
+    lines += ["", "## ⚠️ Blockers", "### 仍未解除"]
+    if not rollup["blockers"]["open"]:
+        lines.append("- 无")
+    for b in rollup["blockers"]["open"]:
+        lines.append(f"- {b['blocker']}（{names.get(b['member_id'], b['member_id'])}, 自 {b['since']}）")
+    lines.append("### 已解除")
+    if not rollup["blockers"]["resolved"]:
+        lines.append("- 无")
+    for b in rollup["blockers"]["resolved"]:
+        lines.append(f"- ~~{b['blocker']}~~（{names.get(b['member_id'], b['member_id'])}, "
+                     f"{b['since']} ~ {b['last_seen']}）")
+
+    lines += ["", "━━━━━━━━━━━━━━━━━━━━━━━━━━━━", ""]
+    return "\n".join(lines)
+
+
+# ============ 主要功能 ============
+def rollup(
+    period: str = "week",
+    end: str = None,
+    team: str = None,
+    member: str = None,
+    date_from: str = None,
+    date_to: str = None,
+    client: github_sync.HubClient = None
+) -> Dict:
+    """
+    生成周报 / 月报
+
+    Args:
+        period: "week" 或 "month"，给了 date_from/date_to 时忽略
+        end: 截止日期，默认今天
+        member: 只汇总该成员（成员 ID）
+        client: HubClient，不传时使用默认客户端
+
+    Returns:
+        build_rollup() 的结构化结果，另加 "markdown" 字段
+
+    Examples:
+        rollup("week")                       # 本周全队
+        rollup("month", member="kkkaka-oss") # 本月个人
+    """
+    if not (date_from and date_to):
+        date_from, date_to = period_range(period, end)
+
+    members = [member] if member else None
+    client = client or github_sync.get_default_client()
+    team = team or client.team
+    logs = client.pull_team_logs_range(team, date_from, date_to, members=members)
+
+    result = build_rollup(logs, date_from, date_to)
+    result["markdown"] = render_markdown(result)
+    return result
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if not args or args[0] not in ("week", "month"):
+        print("""
+周报 / 月报汇总
+
+用法:
+  python rollup.py week [截止日期] [--member ID] [--team china] [--json]
+  python rollup.py month [截止日期] [--member ID] [--team china] [--json]
+        """)
+        sys.exit(1)
+
+    period = args.pop(0)
+    options = {"--member": None, "--team": None}
+    as_json = False
+    end = None
+    while args:
+        arg = args.pop(0)
+        if arg == "--json":
+            as_json = True
+        elif arg in options and args:
+            options[arg] = args.pop(0)
+        else:
+            end = arg
+
+    result = rollup(period, end, team=options["--team"], member=options["--member"])
+    if as_json:
+        result.pop("markdown")
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print(result["markdown"])
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+团队日志语义检索（本地 TF-IDF 向量索引）
+
+"有人做过 xxx 吗" 这类问题常常用词不一致，子串匹配会漏掉。
+这里把所有日志按字符 n-gram 做 TF-IDF 向量，存在本地内存映射文件里，
+查询时用向量化的余弦相似度 + top-k 选择，不依赖任何外部服务。
+
+依赖: numpy
+
+用法:
+    python semantic_search.py sync [team]          # 增量同步索引
+    python semantic_search.py query "视频自动生成"   # 语义检索
+"""
+
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import os
+import json
+import numpy as np
+from typing import Optional, Dict, List
+
+try:
+    from . import github_sync
+except ImportError:
+    import github_sync
+
+# ============ 配置 ============
+INDEX_DIR = os.path.join(os.path.dirname(__file__), ".semantic_index")
+DEFAULT_DIM = 4096          # 哈希特征维度，每篇日志 16KB
+NGRAM_SIZES = (2, 3)        # 字符 n-gram，中文不分词也能匹配
+
+_VECTORS_FILE = "vectors.f32"
+_DF_FILE = "df.npy"
+_NORMS_FILE = "norms.npy"
+_META_FILE = "meta.json"
+
+# n-gram 哈希用的乘数（uint64 溢出回绕即可，结果跨进程稳定）
+_HASH_MULT = np.uint64(0x9E3779B97F4A7C15)
+
+
+# ============ 特征提取 ============
+def _normalize_text(text: str) -> str:
+    """小写并压缩空白，去掉 front matter 分隔线等噪声"""
+    return " ".join(text.lower().replace("━", " ").split())
+
+def text_to_vector(text: str, dim: int = DEFAULT_DIM) -> np.ndarray:
+    """
+    把文本转换为字符 n-gram 的次线性 TF 向量（哈希到 dim 维）
+
+    整个过程在 numpy 上完成：码点数组 → 滚动哈希 → bincount
+    """
+    codes = np.frombuffer(_normalize_text(text).encode("utf-32-le"), dtype=np.uint32)
+    codes = codes.astype(np.uint64)
+    buckets = []
+    with np.errstate(over="ignore"):
+        for n in NGRAM_SIZES:
+            if len(codes) < n:
+                continue
+            h = np.full(len(codes) - n + 1, n, dtype=np.uint64)
+            for i in range(n):
+                h = h * _HASH_MULT + codes[i:len(codes) - n + 1 + i]
+            buckets.append((h >> np.uint64(20)) % np.uint64(dim))
+    vec = np.zeros(dim, dtype=np.float32)
+    if buckets:
+        counts = np.bincount(np.concatenate(buckets).astype(np.int64), minlength=dim)
+        nz = counts > 0
+        vec[nz] = 1.0 + np.log(counts[nz])
+    return vec
+
+
+# ============ 索引 ============
+class SemanticIndex:
+    """
+    内存映射的 TF-IDF 索引
+
+    - vectors.f32: (capacity, dim) 的 float32 矩阵，每行一篇日志的 TF 向量
+    - df.npy: 每个特征出现在多少篇日志中，用于计算 IDF
+    - norms.npy: 每行按当前 IDF 加权后的范数，保存时预先算好，查询时直接用
+    - meta.json: 每行对应的日志信息（路径、sha、成员、日期、链接）
+
+    同一路径再次写入时原地覆盖对应行，sha 未变则跳过，支持增量更新。
+    """
+
+    def __init__(self, index_dir: str = INDEX_DIR, dim: int = DEFAULT_DIM):
+        self.index_dir = index_dir
+        os.makedirs(index_dir, exist_ok=True)
+
+        meta_path = os.path.join(index_dir, _META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            self.df = np.load(os.path.join(index_dir, _DF_FILE))
+        else:
+            self.meta = {"dim": dim, "capacity": 0, "docs": []}
+            self.df = np.zeros(dim, dtype=np.int64)
+
+        self.dim = self.meta["dim"]
+        self._rows = {doc["path"]: i for i, doc in enumerate(self.meta["docs"])}
+        self._vectors = None
+        self._open_vectors()
+        self._weights_cache = None
+
+        norms_path = os.path.join(index_dir, _NORMS_FILE)
+        if os.path.exists(norms_path):
+            norms = np.load(norms_path)
+            if len(norms) == len(self):
+                self._weights_cache = (self._idf2(), norms)
+
+    # ---------- 存储 ----------
+    def _open_vectors(self):
+        path = os.path.join(self.index_dir, _VECTORS_FILE)
+        capacity = self.meta["capacity"]
+        if capacity == 0:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(path, dtype=np.float32, mode="r+",
+                                  shape=(capacity, self.dim))
+
+    def _grow(self, needed: int):
+        """容量不足时按倍数扩展文件，已有数据原地保留"""
+        capacity = self.meta["capacity"]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        path = os.path.join(self.index_dir, _VECTORS_FILE)
+        with open(path, "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+        self.meta["capacity"] = new_capacity
+        self._open_vectors()
+
+    def save(self):
+        """把向量、DF、加权范数和元数据写回磁盘"""
+        if self._vectors is not None:
+            self._vectors.flush()
+        np.save(os.path.join(self.index_dir, _DF_FILE), self.df)
+        _, norms = self._weights()
+        np.save(os.path.join(self.index_dir, _NORMS_FILE), norms)
+        meta_path = os.path.join(self.index_dir, _META_FILE)
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+        os.replace(tmp, meta_path)
+
+    def __len__(self) -> int:
+        return len(self.meta["docs"])
+
+    # ---------- 更新 ----------
+    def get_sha(self, path: str) -> Optional[str]:
+        row = self._rows.get(path)
+        return self.meta["docs"][row].get("sha") if row is not None else None
+
+    def add(self, path: str, content: str, sha: str = None, **info) -> bool:
+        """
+        写入一篇日志（已存在则覆盖）
+
+        Args:
+            path: 仓库内路径，作为唯一键
+            content: 日志全文
+            sha: 文件 sha，与索引中一致时跳过
+            info: 额外信息，如 member_id / date / url
+
+        Returns:
+            是否实际写入
+        """
+        row = self._rows.get(path)
+        if row is not None and sha and self.meta["docs"][row].get("sha") == sha:
+            return False
+
+        vec = text_to_vector(content, self.dim)
+        if row is None:
+            row = len(self.meta["docs"])
+            self._grow(row + 1)
+            self.meta["docs"].append({})
+            self._rows[path] = row
+        else:
+            self.df -= self._vectors[row] > 0
+
+        self._vectors[row] = vec
+        self.df += vec > 0
+        self.meta["docs"][row] = {"path": path, "sha": sha, **info}
+        self._weights_cache = None
+        return True
+
+    # ---------- 查询 ----------
+    def _idf2(self) -> np.ndarray:
+        n = len(self)
+        idf = np.log((1.0 + n) / (1.0 + self.df)).astype(np.float32) + 1.0
+        return idf * idf
+
+    def _weights(self):
+        """IDF² 权重和每行的加权范数，索引不变时复用"""
+        if self._weights_cache is None:
+            n = len(self)
+            idf2 = self._idf2()
+            norms = np.ones(n, dtype=np.float32)
+            # 分块计算，避免整块矩阵平方产生同样大小的临时数组
+            for start in range(0, n, 1024):
+                block = self._vectors[start:min(start + 1024, n)]
+                norms[start:start + len(block)] = np.sqrt((block * block) @ idf2)
+            norms[norms == 0] = 1.0
+            self._weights_cache = (idf2, norms)
+        return self._weights_cache
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict]:
+        """
+        余弦相似度检索
+
+        Returns:
+            [{"score": 0.42, "path": "...", "member_id": "...", "date": "...", "url": "..."}, ...]
+        """
+        n = len(self)
+        if n == 0:
+            return []
+
+        idf2, norms = self._weights()
+        q = text_to_vector(query, self.dim)
+        q_norm = float(np.sqrt((q * q) @ idf2))
+        if q_norm == 0:
+            return []
+
+        scores = (self._vectors[:n] @ (q * idf2)) / (norms * q_norm)
+
+        k = min(top_k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {"score": round(float(scores[i]), 4), **self.meta["docs"][i]}
+            for i in top if scores[i] > 0
+        ]
+
+
+# ============ 同步 ============
+def sync_index(
+    team: str = None,
+    member: str = None,
+    index_dir: str = INDEX_DIR,
+    client: github_sync.HubClient = None
+) -> Dict:
+    """
+    增量同步团队日志到本地索引
+
+    只读取目录列表比较 sha，新增或修改过的日志才会下载。
+    client 不传时使用默认客户端。
+
+    Returns:
+        {"indexed": 新写入篇数, "total": 索引总篇数}
+    """
+    client = client or github_sync.get_default_client()
+    team = team or client.team
+    index = SemanticIndex(index_dir)
+    indexed = 0
+
+    for member_id, log_files in client.list_team_log_files(team, member).items():
+        for log_file in log_files:
+            if index.get_sha(log_file["path"]) == log_file["sha"]:
+                continue
+            content = client.fetch_log_file(log_file)
+            if content is None:
+                continue
+            index.add(
+                log_file["path"], content, sha=log_file["sha"],
+                member_id=member_id,
+                date=log_file["name"].replace("_log.md", ""),
+                url=log_file["html_url"],
+            )
+            indexed += 1
+
+    index.save()
+    print(f"📚 索引同步完成: 新增/更新 {indexed} 篇，共 {len(index)} 篇")
+    return {"indexed": indexed, "total": len(index)}
+
+
+def semantic_search(query: str, top_k: int = 5, index_dir: str = INDEX_DIR) -> List[Dict]:
+    """
+    语义检索团队日志（"有人做过 xxx 吗"）
+
+    Examples:
+        semantic_search("自动生成讲解视频")
+        # 能找到写着 "Remotion 渲染 + 语音合成 pipeline" 的日志
+    """
+    return SemanticIndex(index_dir).search(query, top_k)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("""
+团队日志语义检索
+
+用法:
+  python semantic_search.py sync [team]        # 增量同步索引
+  python semantic_search.py query "内容" [k]    # 语义检索
+        """)
+        sys.exit(1)
+
+    cmd = sys.argv[1]
+
+    if cmd == "sync":
+        team = sys.argv[2] if len(sys.argv) > 2 else None
+        sync_index(team)
+
+    elif cmd == "query" and len(sys.argv) >= 3:
+        top_k = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+        results = semantic_search(sys.argv[2], top_k)
+        if not results:
+            print("未找到相关日志（先运行 sync 建立索引）")
+        for r in results:
+            print(f"📋 {r.get('member_id')} ({r.get('date')})  相似度 {r['score']}")
+            print(f"   {r.get('url', r['path'])}")
+
+    else:
+        print("❌ 未知命令")
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+日志存储后端
+
+github_sync 的读写都通过 StorageBackend 接口完成，目前有两种实现：
+- RestBackend（github_sync.py）：GitHub REST contents API，逐文件读写
+- LocalCloneBackend（本文件）：本地浅克隆 + sparse-checkout，
+  读日志就是读本地文件，多次写入先在本地 commit，最后一次 git push
+
+用法:
+    from scripts.github_sync import set_backend
+    from scripts.storage import LocalCloneBackend
+
+    set_backend(LocalCloneBackend("~/.aiec-hub"))
+"""
+
+import os
+import time
+import base64
+import threading
+import subprocess
+from typing import Optional, Dict, List, Callable
+
+MEMBERS_ROOT = "成员日志 members"
+
+# 同一个克隆目录可能被多个客户端 / 线程共用，git 操作按目录串行
+_workdir_locks: Dict[str, threading.RLock] = {}
+_workdir_locks_guard = threading.Lock()
+
+def _workdir_lock(workdir: str) -> threading.RLock:
+    with _workdir_locks_guard:
+        return _workdir_locks.setdefault(workdir, threading.RLock())
+
+
+class StorageBackend:
+    """
+    存储后端接口
+
+    路径均为仓库内的相对路径（如 "成员日志 members/中国团队 china-team/xxx/2026-01-26_log.md"）。
+    目录项沿用 contents API 的字段：name / path / type("dir"/"file") / sha / html_url / download_url。
+    """
+
+    def read(self, path: str, until: Callable[[str], bool] = None) -> Optional[str]:
+        """
+        读取单个文件，不存在返回 None
+
+        until: 提前结束条件，参数为已读到的文本；远程后端可以据此只下载开头部分，
+            本地后端可以忽略（返回全文也满足调用方）
+        """
+        raise NotImplementedError
+
+    def read_many(self, paths: List[str]) -> Dict[str, str]:
+        """读取多个文件，返回 {路径: 内容}，不存在的文件不出现"""
+        results = {}
+        for path in paths:
+            content = self.read(path)
+            if content is not None:
+                results[path] = content
+        return results
+
+    def list_dir(self, path: str) -> List[Dict]:
+        """列出目录，不存在返回空列表"""
+        raise NotImplementedError
+
+    def write(self, path: str, content: str, message: str) -> Dict:
+        """写入单个文件，返回 {"success": True, "url": "..."} 或 {"success": False, "error": "..."}"""
+        raise NotImplementedError
+
+    def write_many(self, files: Dict[str, str], message: str) -> Dict:
+        """把多个文件作为一次提交写入"""
+        raise NotImplementedError
+
+    def flush(self) -> Dict:
+        """把本地暂存的写入推送到远端（没有本地暂存的后端直接成功）"""
+        return {"success": True}
+
+
+class LocalCloneBackend(StorageBackend):
+    """
+    基于本地 git 克隆的后端
+
+    首次使用时浅克隆（--depth 1, --filter=blob:none, --sparse），
+    只检出 "成员日志 members/"。读操作直接读工作区，距上次 fetch 超过 max_age 秒时
+    先 sync()（fetch + rebase）拿到队友的新日志；
+    write / write_many 只在本地 commit，调用 flush() 时才 git push。
+
+    Args:
+        workdir: 本地克隆目录
+        remote_url: 远端地址，默认 https://github.com/{repo}.git；
+            也可以是本地 bare 仓库（file:///path/to/hub.git）
+        repo: "owner/name"，用于默认远端和生成网页链接
+        branch: 分支名
+        token: GitHub token，每次 git 调用时通过 http.extraHeader 传入，不写进 .git/config
+            （blob:none 克隆在 checkout / rebase 时也会按需从远端取 blob）
+        max_age: 读操作前允许的最长未 fetch 时间（秒），0 表示每次读都 fetch，None 表示不自动 fetch
+    """
+
+    def __init__(
+        self,
+        workdir: str,
+        remote_url: str = None,
+        repo: str = "AIEC-Team/AIEC-agent-hub",
+        branch: str = "main",
+        token: str = None,
+        max_age: Optional[float] = 60
+    ):
+        self.workdir = os.path.abspath(os.path.expanduser(workdir))
+        self.repo = repo
+        self.branch = branch
+        self.remote_url = remote_url or f"https://github.com/{repo}.git"
+        self.token = token
+        self.max_age = max_age
+        self._lock = _workdir_lock(self.workdir)
+        with self._lock:
+            self._ensure_clone()
+        self._last_sync = time.time()
+
+    # ---------- git ----------
+    def _auth_args(self) -> List[str]:
+        if not self.token or not self.remote_url.startswith("https://"):
+            return []
+        basic = base64.b64encode(f"x-access-token:{self.token}".encode()).decode()
+        return ["-c", f"http.extraHeader=Authorization: basic {basic}"]
+
+    def _git(self, *args: str, cwd: str = None) -> str:
+        # 部分克隆随时可能按需取 blob，所有命令都带上认证
+        cmd = ["git"] + self._auth_args() + list(args)
+        r = subprocess.run(cmd, cwd=cwd or self.workdir, capture_output=True,
+                           text=True, encoding="utf-8")
+        if r.returncode != 0:
+            raise RuntimeError(f"git {args[0]} 失败: {r.stderr.strip() or r.stdout.strip()}")
+        return r.stdout
+
+    def _ensure_clone(self):
+        if os.path.isdir(os.path.join(self.workdir, ".git")):
+            return
+        parent = os.path.dirname(self.workdir)
+        os.makedirs(parent, exist_ok=True)
+        self._git("clone", "--depth", "1", "--filter=blob:none", "--sparse",
+                  "--branch", self.branch, self.remote_url, self.workdir,
+                  cwd=parent)
+        self._git("sparse-checkout", "set", MEMBERS_ROOT)
+        # 本地提交需要作者信息，仓库没配置时用通用身份
+        if not self._config("user.email"):
+            self._git("config", "user.email", "agent-hub-sync@users.noreply.github.com")
+            self._git("config", "user.name", "agent-hub-sync")
+
+    def _config(self, key: str) -> str:
+        r = subprocess.run(["git", "config", key], cwd=self.workdir,
+                           capture_output=True, text=True, encoding="utf-8")
+        return r.stdout.strip()
+
+    def sync(self) -> Dict:
+        """拉取远端更新；本地尚未推送的提交会 rebase 到最新远端之上"""
+        with self._lock:
+            return self._sync()
+
+    def _sync(self) -> Dict:
+        self._last_sync = time.time()
+        try:
+            # 不带 --depth，只补齐新提交，和本地浅历史保持连通
+            self._git("fetch", "origin", self.branch)
+            self._git("rebase", "FETCH_HEAD")
+            return {"success": True}
+        except RuntimeError as e:
+            # rebase 冲突时回到 rebase 前的状态，本地提交保留
+            subprocess.run(["git", "rebase", "--abort"], cwd=self.workdir, capture_output=True)
+            return {"success": False, "error": str(e)}
+
+    def _refresh(self):
+        """读操作前按 max_age 节流地 sync，失败时（如离线）继续读本地快照"""
+        if self.max_age is None or time.time() - self._last_sync < self.max_age:
+            return
+        with self._lock:
+            if time.time() - self._last_sync < self.max_age:
+                return
+            result = self._sync()
+        if not result["success"]:
+            print(f"⚠️ 本地克隆更新失败，使用本地快照: {result['error']}")
+
+    def pending_commits(self) -> int:
+        """本地尚未推送的提交数"""
+        try:
+            out = self._git("rev-list", "--count", f"origin/{self.branch}..HEAD")
+            return int(out.strip() or 0)
+        except RuntimeError:
+            return 0
+
+    # ---------- 读 ----------
+    def _abs(self, path: str) -> str:
+        return os.path.join(self.workdir, *path.split("/"))
+
+    def _html_url(self, path: str) -> str:
+        return f"https://github.com/{self.repo}/blob/{self.branch}/{path}"
+
+    def read(self, path: str, until: Callable[[str], bool] = None) -> Optional[str]:
+        self._refresh()
+        try:
+            with open(self._abs(path), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def list_dir(self, path: str) -> List[Dict]:
+        path = path.rstrip("/")
+        self._refresh()
+        try:
+            # -z 避免中文路径被转义；sha 与 contents API 返回的 blob sha 一致
+            with self._lock:
+                out = self._git("ls-tree", "-z", "HEAD", "--", f"{path}/")
+        except RuntimeError:
+            return []
+        entries = []
+        for record in out.split("\0"):
+            if not record:
+                continue
+            meta, full_path = record.split("\t", 1)
+            _, obj_type, sha = meta.split()
+            entries.append({
+                "name": full_path.rsplit("/", 1)[-1],
+                "path": full_path,
+                "type": "dir" if obj_type == "tree" else "file",
+                "sha": sha,
+                "html_url": self._html_url(full_path),
+                "download_url": None,
+            })
+        return entries
+
+    # ---------- 写 ----------
+    def write(self, path: str, content: str, message: str) -> Dict:
+        return self.write_many({path: content}, message)
+
+    def write_many(self, files: Dict[str, str], message: str) -> Dict:
+        with self._lock:
+            return self._write_many(files, message)
+
+    def _write_many(self, files: Dict[str, str], message: str) -> Dict:
+        try:
+            for path, content in files.items():
+                abs_path = self._abs(path)
+                os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+                with open(abs_path, "w", encoding="utf-8", newline="\n") as f:
+                    f.write(content)
+            self._git("add", "--", *files.keys())
+            # 内容没有变化时不提交，返回值与提交成功时一致
+            unchanged = not self._git("status", "--porcelain", "--", *files.keys()).strip()
+            if not unchanged:
+                self._git("commit", "-q", "-m", message)
+            sha = self._git("rev-parse", "HEAD").strip()
+        except (OSError, RuntimeError) as e:
+            return {"success": False, "error": str(e)}
+        urls = [self._html_url(p) for p in files]
+        result = {"success": True, "sha": sha, "url": urls[0] if len(urls) == 1 else "",
+                  "committed_locally": True}
+        if unchanged:
+            result["unchanged"] = True
+        return result
+
+    def flush(self, retries: int = 3) -> Dict:
+        """
+        一次 git push 推送所有本地提交
+
+        远端有新提交导致推送被拒时，先 sync() rebase 再重试。
+        """
+        with self._lock:
+            return self._flush(retries)
+
+    def _flush(self, retries: int) -> Dict:
+        pending = self.pending_commits()
+        if pending == 0:
+            return {"success": True, "pushed": 0}
+
+        error = ""
+        for _ in range(retries):
+            try:
+                self._git("push", "origin", f"HEAD:{self.branch}")
+                return {"success": True, "pushed": pending}
+            except RuntimeError as e:
+                error = str(e)
+                synced = self._sync()
+                if not synced["success"]:
+                    error = synced["error"]
+                    break
+        return {"success": False, "error": error, "pending": pending}
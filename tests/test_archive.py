@@ -0,0 +1,105 @@
+"""LogArchive 增量写盘的测试"""
+
+import os
+import sys
+import json
+import shutil
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import github_sync  # noqa: E402
+import archive  # noqa: E402
+
+
+def make_log(member_id, date, done, project, note=""):
+    return github_sync.create_log_content(
+        member_id, member_id, "china", date, f"{member_id} {date}\n{note}",
+        {"done": [{"content": task, "project": project} for task in done]},
+    )
+
+
+def add(log_archive, member_id, date, done, project="proj-a", sha=None, note=""):
+    path = f"{member_id}/{date}_log.md"
+    log_archive.add(path, make_log(member_id, date, done, project, note), member_id, date,
+                    sha=sha or path)
+
+
+def test_interrupted_save_keeps_rows_aligned(tmp_path):
+    archive_dir = str(tmp_path / "archive")
+    log_archive = archive.LogArchive(archive_dir)
+    add(log_archive, "alice", "2026-01-01", ["a1"])
+    log_archive.save()
+
+    # 模拟第二次 save() 在写 meta.json 之前中断：列文件已追加，meta 仍是旧的
+    meta_path = os.path.join(archive_dir, "meta.json")
+    shutil.copy(meta_path, meta_path + ".bak")
+    interrupted = archive.LogArchive(archive_dir)
+    add(interrupted, "bob", "2026-01-02", ["b1", "b2", "b3"], "proj-b")
+    interrupted.save()
+    os.replace(meta_path + ".bak", meta_path)
+
+    opened = archive.open_archive(archive_dir)
+    assert len(opened["member"]) == 1
+    assert list(opened["project_offsets"]) == [0, 1]
+    assert archive.tasks_per_project(opened) == {"proj-a": 1}
+
+    resumed = archive.LogArchive(archive_dir)
+    assert len(resumed) == 1
+    add(resumed, "carol", "2026-01-03", ["c1", "c2"], "proj-c")
+    resumed.save()
+
+    opened = archive.open_archive(archive_dir)
+    with open(meta_path, encoding="utf-8") as f:
+        assert json.load(f)["rows"] == 2
+    assert [opened["members"][m] for m in opened["member"]] == ["alice", "carol"]
+    assert list(opened["project_offsets"]) == [0, 1, 3]
+    assert archive.tasks_per_project(opened) == {"proj-c": 2, "proj-a": 1}
+    assert "alice 2026-01-01" in archive.read_body(opened, 0)
+    assert "carol 2026-01-03" in archive.read_body(opened, 1)
+
+
+def test_interrupted_update_keeps_previous_generation(tmp_path, monkeypatch):
+    archive_dir = str(tmp_path / "archive")
+    log_archive = archive.LogArchive(archive_dir)
+    add(log_archive, "alice", "2026-01-01", ["a1"])
+    add(log_archive, "bob", "2026-01-02", ["b1"], "proj-b")
+    log_archive.save()
+
+    # 更新第 0 行（正文变长），在写正文偏移量时中断
+    def update(target):
+        add(target, "alice", "2026-01-01", ["a1", "a2"], sha="v2", note="补充说明 " * 20)
+
+    save_npy = archive._save_npy
+
+    def failing_save_npy(path, array):
+        if os.path.basename(path).startswith("body_offsets"):
+            raise KeyboardInterrupt
+        save_npy(path, array)
+
+    interrupted = archive.LogArchive(archive_dir)
+    update(interrupted)
+    monkeypatch.setattr(archive, "_save_npy", failing_save_npy)
+    with pytest.raises(KeyboardInterrupt):
+        interrupted.save()
+    monkeypatch.setattr(archive, "_save_npy", save_npy)
+
+    opened = archive.open_archive(archive_dir)
+    assert "补充说明" not in archive.read_body(opened, 0)
+    assert list(opened["tasks_done"]) == [1, 1]
+    assert "bob 2026-01-02" in archive.read_body(opened, 1)
+    assert archive.tasks_per_project(opened) == {"proj-a": 1, "proj-b": 1}
+
+    # 重新导出同样的更新可以正常完成，旧一代文件被清理
+    resumed = archive.LogArchive(archive_dir)
+    update(resumed)
+    resumed.save()
+
+    opened = archive.open_archive(archive_dir)
+    assert "补充说明" in archive.read_body(opened, 0)
+    assert list(opened["tasks_done"]) == [2, 1]
+    assert "bob 2026-01-02" in archive.read_body(opened, 1)
+    assert archive.tasks_per_project(opened) == {"proj-a": 2, "proj-b": 1}
+    assert sorted(os.listdir(archive_dir)) == sorted(
+        [archive._file_name(name, 1) for name in archive._DATA_FILES] + ["meta.json"])
@@ -0,0 +1,83 @@
+"""专长索引增量同步和 who_knows 查询的测试"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import github_sync  # noqa: E402
+import expertise_index  # noqa: E402
+
+
+class FakeHub:
+    """只实现 sync_index 用到的两个方法，记录下载过的文件"""
+
+    team = "china"
+
+    def __init__(self):
+        self.logs = {}
+        self.fetched = []
+
+    def put(self, member_id, date, projects=(), topic=None, sha="1"):
+        content = github_sync.create_log_content(
+            member_id, member_id.title(), "china", date, "正文", {
+                "done": [{"content": f"做 {p}", "project": p} for p in projects],
+                "ai_learning": {"topic": topic} if topic else {},
+            })
+        path = github_sync.get_file_path(member_id, "china", date)
+        self.logs[path] = {"member_id": member_id, "name": f"{date}_log.md",
+                           "path": path, "sha": sha, "content": content}
+
+    def list_team_log_files(self, team=None, member=None):
+        listing = {}
+        for log in self.logs.values():
+            listing.setdefault(log["member_id"], []).append(log)
+        return listing
+
+    def fetch_log_file(self, log_file, until=None):
+        self.fetched.append(log_file["path"])
+        return log_file["content"]
+
+
+def test_sync_only_fetches_new_or_changed_logs(tmp_path):
+    index_file = str(tmp_path / "index.json")
+    hub = FakeHub()
+    hub.put("alice", "2026-03-01", ["Remotion"], topic="Prompt 优化")
+    hub.put("bob", "2026-03-02", ["remotion-video", "agent-hub"])
+
+    assert expertise_index.sync_index(index_file=index_file, client=hub) == {"indexed": 2, "total": 2}
+    assert len(hub.fetched) == 2
+
+    hub.fetched.clear()
+    assert expertise_index.sync_index(index_file=index_file, client=hub) == {"indexed": 0, "total": 2}
+    assert hub.fetched == []
+
+    # 修改一篇（sha 变化）、新增一篇：只下载这两篇
+    hub.put("alice", "2026-03-01", ["agent-hub"], topic="Prompt 优化", sha="2")
+    hub.put("alice", "2026-03-05", ["Remotion"])
+    assert expertise_index.sync_index(index_file=index_file, client=hub) == {"indexed": 2, "total": 3}
+    assert len(hub.fetched) == 2
+
+    index = expertise_index.load_index(index_file)
+    entry = index["files"][github_sync.get_file_path("alice", "china", "2026-03-01")]
+    assert entry["projects"] == ["agent-hub"]
+    assert entry["topics"] == ["Prompt 优化"]
+    assert entry["member_name"] == "Alice"
+
+
+def test_who_knows(tmp_path):
+    index_file = str(tmp_path / "index.json")
+    hub = FakeHub()
+    hub.put("alice", "2026-03-01", ["Remotion"])
+    hub.put("alice", "2026-03-04", ["Remotion", "Remotion"])
+    hub.put("bob", "2026-03-02", ["remotion-video"], topic="FFmpeg")
+    expertise_index.sync_index(index_file=index_file, client=hub)
+
+    results = expertise_index.who_knows("remotion", index_file=index_file)
+    assert [(r["member_id"], r["count"], r["last_active"]) for r in results] == [
+        ("alice", 2, "2026-03-04"), ("bob", 1, "2026-03-02")]
+    assert results[1]["matched"] == ["remotion-video"]
+
+    assert [r["member_id"] for r in expertise_index.who_knows("ffmpeg", index_file=index_file)] == ["bob"]
+    assert expertise_index.who_knows("  ", index_file=index_file) == []
+    assert expertise_index.who_knows("remotion", limit=1, index_file=index_file)[0]["member_id"] == "alice"
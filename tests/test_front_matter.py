@@ -0,0 +1,67 @@
+"""parse_front_matter 对 create_log_content 输出的解析测试"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import github_sync  # noqa: E402
+
+
+def make_log(structured_data=None, content="正文\n包含 key: value 的一行"):
+    return github_sync.create_log_content(
+        "alice", "Alice", "china", "2026-03-09", content, structured_data)
+
+
+def test_nested_tasks_and_ai_learning():
+    fm = github_sync.parse_front_matter(make_log({
+        "done": [{"content": "完成 A", "project": "ai-tutor"}, {"content": "完成 B"}],
+        "in_progress": [{"content": "进行中", "blockers": ["等待审批", "缺数据"]}],
+        "tomorrow": [{"content": "明天做"}],
+        "ai_learning": {"topic": "Prompt 优化", "insight": "先给例子", "applied_to": "ai-tutor"},
+    }))
+
+    assert fm["member_id"] == "alice"
+    assert fm["member_name"] == "Alice"
+    assert fm["date"] == "2026-03-09"
+    assert fm["team"] == "china"
+    assert fm["tasks_done"] == [{"content": "完成 A", "project": "ai-tutor"}, {"content": "完成 B"}]
+    assert fm["tasks_in_progress"] == [{"content": "进行中", "blockers": ["等待审批", "缺数据"]}]
+    assert fm["tasks_tomorrow"] == [{"content": "明天做"}]
+    assert fm["ai_learning"] == {"topic": "Prompt 优化", "insight": "先给例子", "applied_to": "ai-tutor"}
+    assert fm["blockers"] == ["等待审批", "缺数据"]
+
+
+def test_inline_lists():
+    fm = github_sync.parse_front_matter(make_log({"done": [{"content": "x"}]}))
+    assert fm["blockers"] == []
+
+    fm = github_sync.parse_front_matter("---\ntags: ['a', \"b c\"]\nbad: [not python\n---\n")
+    assert fm == {"tags": ["a", "b c"], "bad": "[not python"}
+
+
+def test_colons_inside_values():
+    fm = github_sync.parse_front_matter(make_log({
+        "done": [{"content": "修复: 登录超时", "project": "hub"}],
+        "tomorrow": [{"content": "10:30 评审"}],
+        "ai_learning": {"topic": "RAG", "insight": "检索: 先粗后精"},
+    }))
+
+    assert fm["synced_at"].startswith("20") and fm["synced_at"].endswith("+08:00")
+    assert fm["tasks_done"] == [{"content": "修复: 登录超时", "project": "hub"}]
+    assert fm["tasks_tomorrow"] == [{"content": "10:30 评审"}]
+    assert fm["ai_learning"]["insight"] == "检索: 先粗后精"
+
+
+def test_plain_list_items_and_missing_front_matter():
+    fm = github_sync.parse_front_matter("---\nitems:\n  - a\n  - \"b: c\"\nnext: 1\n---\nbody")
+    assert fm == {"items": ["a", "b: c"], "next": "1"}
+
+    assert github_sync.parse_front_matter("no front matter") == {}
+    assert github_sync.parse_front_matter("---\nunterminated: yes") == {}
+
+
+def test_log_without_structured_data():
+    fm = github_sync.parse_front_matter(make_log())
+    assert "tasks_done" not in fm
+    assert fm["source"] == "claude-skill"
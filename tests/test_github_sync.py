@@ -0,0 +1,234 @@
+"""HubClient 的 REST 调用和模块级函数测试（不访问网络）"""
+
+import os
+import sys
+import json
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import github_sync  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None):
+        self.status_code = status_code
+        self._data = data if data is not None else {}
+        self.headers = {}
+        self.text = json.dumps(self._data)
+
+    def json(self):
+        return self._data
+
+
+def record_requests(client, responses):
+    """把 client.request 替换为按顺序返回 responses 的假实现，返回记录的调用"""
+    calls = []
+
+    def request(method, url, headers=None, timeout=10, **kwargs):
+        calls.append({"method": method, "url": url, **kwargs})
+        return responses.pop(0) if responses else FakeResponse(404)
+
+    client.request = request
+    return calls
+
+
+def make_client(tmp_path, **kwargs):
+    return github_sync.HubClient(token="x", spool_file=str(tmp_path / "spool.jsonl"), **kwargs)
+
+
+def test_rest_backend_uses_client_branch(tmp_path):
+    client = make_client(tmp_path, branch="staging")
+    calls = record_requests(client, [
+        FakeResponse(200, []),
+        FakeResponse(200, {"sha": "abc"}),
+        FakeResponse(200, {"content": {"html_url": "u"}}),
+    ])
+
+    client.get_backend().list_dir("成员日志 members")
+    client.get_backend().write("a/2026-01-01_log.md", "x", "msg")
+
+    assert calls[0]["params"] == {"ref": "staging"}
+    assert calls[1]["params"] == {"ref": "staging"}
+    assert calls[2]["method"] == "PUT"
+    assert calls[2]["json"]["branch"] == "staging"
+    assert calls[2]["json"]["sha"] == "abc"
+
+
+def test_module_functions_use_default_client_identity(tmp_path, monkeypatch):
+    bob = make_client(tmp_path, member_id="bob", member_name="Bob", team="middle_east")
+    monkeypatch.setattr(github_sync, "_default_client", bob)
+
+    result = github_sync.push_log("hello", date="2026-01-02", defer=True)
+
+    assert result["path"] == github_sync.get_file_path("bob", "middle_east", "2026-01-02")
+    with open(bob.spool_file, encoding="utf-8") as f:
+        entry = json.loads(f.readline())
+    assert entry["member_id"] == "bob"
+    assert "member_name: Bob" in entry["content"]
+
+
+def test_push_log_structured_data_with_quotes_is_valid_yaml(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    client = make_client(tmp_path)
+    tasks = ['修复 "登录" 超时', r"清理 C:\temp", "多行\n任务"]
+
+    client.push_log("hello", date="2026-01-03", defer=True, structured_data={
+        "done": [{"content": t} for t in tasks],
+        "ai_learning": {"topic": 'Prompt "few-shot"'},
+    })
+    with open(client.spool_file, encoding="utf-8") as f:
+        content = json.loads(f.readline())["content"]
+
+    expected = [tasks[0], tasks[1], "多行 任务"]
+    front_matter = yaml.safe_load(content.split("---", 2)[1])
+    assert [t["content"] for t in front_matter["tasks_done"]] == expected
+    assert front_matter["ai_learning"]["topic"] == 'Prompt "few-shot"'
+    parsed = github_sync.parse_front_matter(content)
+    assert [t["content"] for t in parsed["tasks_done"]] == expected
+    assert parsed["ai_learning"]["topic"] == 'Prompt "few-shot"'
+
+
+class MemoryBackend(github_sync.StorageBackend):
+    """内存后端：记录每次写入，fail 非空时按顺序返回这些失败结果"""
+
+    def __init__(self):
+        self.files = {}
+        self.commits = []
+        self.fail = []
+
+    def read(self, path, until=None):
+        return self.files.get(path)
+
+    def list_dir(self, path):
+        children = {}
+        for file_path in self.files:
+            if file_path.startswith(path + "/"):
+                name, _, rest = file_path[len(path) + 1:].partition("/")
+                children[name] = {"name": name, "path": f"{path}/{name}",
+                                  "type": "dir" if rest else "file",
+                                  "html_url": f"https://example.com/{path}/{name}"}
+        return sorted(children.values(), key=lambda e: e["name"])
+
+    def write(self, path, content, message):
+        return self.write_many({path: content}, message)
+
+    def write_many(self, files, message):
+        if self.fail:
+            return self.fail.pop(0)
+        self.files.update(files)
+        self.commits.append(dict(files))
+        return {"success": True, "sha": str(len(self.commits)), "url": "u"}
+
+
+def spool_client(tmp_path, **kwargs):
+    return make_client(tmp_path, member_id="alice", backend=MemoryBackend(), **kwargs)
+
+
+def spooled_lines(client):
+    with open(client.spool_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_flush_coalesces_writes_to_the_same_path(tmp_path):
+    client = spool_client(tmp_path)
+    client.push_log("v1", date="2026-02-01", defer=True)
+    client.push_log("v2", date="2026-02-01", defer=True)
+    client.push_log("other day", date="2026-02-02", defer=True)
+
+    result = client.flush_spool(retries=1)
+
+    backend = client.get_backend()
+    assert result["success"] and len(result["pushed"]) == 2
+    assert len(backend.commits) == 1
+    path = github_sync.get_file_path("alice", "china", "2026-02-01")
+    assert "v2" in backend.files[path] and "v1" not in backend.files[path]
+    assert client.pending_logs() == []
+    assert spooled_lines(client) == []
+
+
+def test_direct_push_supersedes_spooled_copy(tmp_path):
+    client = spool_client(tmp_path)
+    client.push_log("old", date="2026-02-01", defer=True)
+    assert client.push_log("new", date="2026-02-01")["success"]
+
+    assert client.pending_logs() == []
+    assert spooled_lines(client)[-1]["superseded"] is True
+
+    assert client.flush_spool(retries=1) == {"success": True, "pushed": []}
+    backend = client.get_backend()
+    path = github_sync.get_file_path("alice", "china", "2026-02-01")
+    assert "new" in backend.files[path]
+    assert len(backend.commits) == 1
+    assert spooled_lines(client) == []
+
+
+def test_flush_keeps_entries_of_other_repos(tmp_path):
+    client = spool_client(tmp_path)
+    other = make_client(tmp_path, member_id="alice", repo="someone/else", backend=MemoryBackend())
+    other.spool_file = client.spool_file
+    other.push_log("elsewhere", date="2026-02-01", defer=True)
+    client.push_log("here", date="2026-02-01", defer=True)
+
+    assert client.flush_spool(retries=1)["success"]
+
+    remaining = spooled_lines(client)
+    assert [e["repo"] for e in remaining] == ["someone/else"]
+    assert len(other.pending_logs()) == 1
+    assert client.pending_logs() == []
+
+
+def test_failed_push_is_spooled(tmp_path):
+    client = spool_client(tmp_path)
+    client.get_backend().fail = [{"success": False, "error": "Token 无效或已过期"}]
+
+    result = client.push_log("keep me", date="2026-02-03")
+
+    assert result["success"] is False and result["queued"] is True
+    assert result["retryable"] is False
+    assert ["keep me" in e["content"] for e in client.pending_logs()] == [True]
+    assert client.flush_spool(retries=1)["success"]
+    assert client.pending_logs() == []
+
+
+def test_rest_conflict_and_rate_limit_are_retryable(tmp_path):
+    client = make_client(tmp_path)
+    conflict = FakeResponse(409, {"message": "sha mismatch"})
+    limited = FakeResponse(403)
+    limited.headers = {"X-RateLimit-Remaining": "0"}
+    record_requests(client, [FakeResponse(404), conflict, limited])
+
+    backend = client.get_backend()
+    assert backend.write("a/2026-01-01_log.md", "x", "m")["retryable"] is True
+    assert backend.write("a/2026-01-01_log.md", "x", "m")["retryable"] is True
+
+
+def test_search_team_logs_batch_scans_each_log_once(tmp_path):
+    client = spool_client(tmp_path)
+    backend = client.get_backend()
+    for member_id, date, text in [
+        ("alice", "2026-03-01", "用 Remotion 渲染\n对接 ElevenLabs"),
+        ("alice", "2026-03-02", "整理文档"),
+        ("bob", "2026-03-01", "去 İstanbul 出差，评估 remotion"),
+    ]:
+        path = github_sync.get_file_path(member_id, "china", date)
+        backend.files[path] = github_sync.create_log_content(member_id, member_id.title(),
+                                                             "china", date, text)
+    reads = []
+    read = backend.read
+    backend.read = lambda path, until=None: reads.append(path) or read(path, until)
+
+    results = client.search_team_logs_batch(["Remotion", "ElevenLabs", "İstanbul"])
+
+    assert len(reads) == 3
+    by_member = {(r["member_id"], r["date"]): r for r in results}
+    assert set(by_member) == {("alice", "2026-03-01"), ("bob", "2026-03-01")}
+    alice = by_member[("alice", "2026-03-01")]
+    assert set(alice["hits"]) == {"Remotion", "ElevenLabs"}
+    assert alice["member_name"] == "Alice"
+    assert "Remotion" in alice["excerpts"]["Remotion"]
+    assert set(by_member[("bob", "2026-03-01")]["hits"]) == {"Remotion", "İstanbul"}
+
+    assert len(client.search_team_logs_batch(["Remotion"], limit=1)) == 1
+    assert client.search_team_logs_batch(["Remotion"], member="bob")[0]["member_id"] == "bob"
@@ -0,0 +1,64 @@
+"""KeywordMatcher（Aho-Corasick 自动机）的测试"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from keyword_matcher import KeywordMatcher, excerpt_at  # noqa: E402
+
+
+def brute_force(keywords, text):
+    """逐个关键词 find 的参考实现"""
+    hits = {}
+    lowered = text.lower()
+    for keyword in dict.fromkeys(k for k in keywords if k):
+        start = lowered.find(keyword.lower())
+        while start != -1:
+            hits.setdefault(keyword, []).append((text.count("\n", 0, start), start))
+            start = lowered.find(keyword.lower(), start + 1)
+    return hits
+
+
+def test_matches_all_keywords_in_one_pass():
+    text = "Remotion 渲染\n接入 ElevenLabs 和 FFmpeg\nremotion 再次"
+    matcher = KeywordMatcher(["Remotion", "ElevenLabs", "FFmpeg", "飞书"])
+
+    assert matcher.scan(text) == {
+        "Remotion": [(0, 0), (2, text.index("remotion"))],
+        "ElevenLabs": [(1, text.index("ElevenLabs"))],
+        "FFmpeg": [(1, text.index("FFmpeg"))],
+    }
+
+
+def test_overlapping_and_nested_keywords():
+    keywords = ["he", "she", "his", "hers", "飞书", "飞书文档"]
+    text = "ushers 飞书文档\nshe said his"
+    assert KeywordMatcher(keywords).scan(text) == brute_force(keywords, text)
+
+
+def test_duplicate_and_empty_keywords_are_ignored():
+    matcher = KeywordMatcher(["api", "", "api"])
+    assert matcher.keywords == ["api"]
+    assert KeywordMatcher([]).scan("anything") == {}
+
+
+def test_keyword_spanning_lines_reports_start_line():
+    assert KeywordMatcher(["a\nb"]).scan("x\na\nb") == {"a\nb": [(1, 2)]}
+
+
+def test_keywords_whose_lowercase_changes_length():
+    # "İ".lower() 为两个字符，关键词和文本需要按同一规则归一化
+    text = "xx İstanbul yy\nistanbul"
+    hits = KeywordMatcher(["İstanbul"]).scan(text)
+    assert hits == {"İstanbul": [(0, 3), (1, 15)]}
+    assert text[3:3 + len("İstanbul")] == "İstanbul"
+
+    assert KeywordMatcher(["istanbul"]).scan("İSTANBUL") == {"istanbul": [(0, 0)]}
+    assert KeywordMatcher(["xİy", "y"]).scan("aXİYb") == {"xİy": [(0, 1)], "y": [(0, 3)]}
+
+
+def test_excerpt_at_clamps_to_document():
+    lines = ["0", "1", "2", "3", "4"]
+    assert excerpt_at(lines, 0) == "0\n1\n2"
+    assert excerpt_at(lines, 4, context=1) == "3\n4"
@@ -0,0 +1,42 @@
+"""log_importer 的转换和参数校验测试"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import github_sync  # noqa: E402
+import log_importer  # noqa: E402
+
+TASKS = ['修复 "登录" 超时', r"清理 C:\temp\cache 目录", '引号结尾"']
+
+
+def write_log(directory, name="2026-03-02.md"):
+    path = directory / name
+    path.write_text("# 今日完成\n" + "".join(f"- {t}\n" for t in TASKS), encoding="utf-8")
+    return str(path)
+
+
+def test_task_text_with_quotes_is_valid_yaml(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    log = log_importer.convert_file(write_log(tmp_path), "alice", "Alice", "china")
+    # structured_data 保持原文，转义只发生在 create_log_content 写 YAML 时
+    assert [t["content"] for t in log["structured_data"]["done"]] == TASKS
+
+    front_matter = yaml.safe_load(log["content"].split("---", 2)[1])
+    assert [t["content"] for t in front_matter["tasks_done"]] == TASKS
+    # 仓库自带的解析器读出的文本与 yaml 一致
+    parsed = github_sync.parse_front_matter(log["content"])
+    assert [t["content"] for t in parsed["tasks_done"]] == TASKS
+
+
+def test_invalid_team_is_rejected_before_converting(tmp_path):
+    for i in range(log_importer.POOL_MIN_FILES):
+        write_log(tmp_path, f"2026-03-0{i + 1}.md")
+    client = github_sync.HubClient(token="x", member_id="alice", team="china")
+
+    result = log_importer.import_logs(str(tmp_path), team="nowhere", dry_run=True, client=client)
+    assert result["success"] is False
+    assert "nowhere" in result["error"]
@@ -0,0 +1,136 @@
+"""LocalCloneBackend 对本地 bare 仓库（file://）的端到端测试"""
+
+import os
+import sys
+import subprocess
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import github_sync  # noqa: E402
+from storage import LocalCloneBackend  # noqa: E402
+
+TEAM_DIR = "成员日志 members/中国团队 china-team"
+
+
+def git(*args, cwd=None):
+    r = subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd, capture_output=True, text=True, encoding="utf-8",
+    )
+    assert r.returncode == 0, r.stderr
+    return r.stdout
+
+
+def commit_file(workdir, path, content, message="add"):
+    abs_path = os.path.join(workdir, *path.split("/"))
+    os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+    with open(abs_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    git("add", "--", path, cwd=workdir)
+    git("commit", "-q", "-m", message, cwd=workdir)
+    git("push", "-q", "origin", "HEAD:main", cwd=workdir)
+
+
+@pytest.fixture
+def hub(tmp_path):
+    """bare 仓库 + 一个模拟队友的普通克隆，仓库里已有 alice 的一篇日志"""
+    bare = tmp_path / "hub.git"
+    git("init", "-q", "--bare", "-b", "main", str(bare))
+    git("config", "uploadpack.allowFilter", "true", cwd=str(bare))
+
+    teammate = tmp_path / "teammate"
+    git("clone", "-q", str(bare), str(teammate))
+    git("checkout", "-q", "-b", "main", cwd=str(teammate))
+    commit_file(str(teammate), "docs/guide.md", "guide\n")
+    commit_file(str(teammate), f"{TEAM_DIR}/alice/2026-01-01_log.md", "alice day 1\n")
+
+    return {"url": bare.as_uri(), "bare": str(bare), "teammate": str(teammate), "tmp": tmp_path}
+
+
+def make_backend(hub, name="clone", **kwargs):
+    return LocalCloneBackend(str(hub["tmp"] / name), remote_url=hub["url"], **kwargs)
+
+
+def remote_file(hub, path):
+    return git("show", f"main:{path}", cwd=hub["bare"])
+
+
+def test_clone_is_sparse_and_reads_logs(hub):
+    backend = make_backend(hub)
+
+    assert backend.read(f"{TEAM_DIR}/alice/2026-01-01_log.md") == "alice day 1\n"
+    # sparse-checkout 只检出成员日志目录
+    assert not os.path.exists(os.path.join(backend.workdir, "docs", "guide.md"))
+    entries = backend.list_dir(TEAM_DIR)
+    assert [(e["name"], e["type"]) for e in entries] == [("alice", "dir")]
+    assert backend.read(f"{TEAM_DIR}/bob/2026-01-01_log.md") is None
+
+
+def test_write_commits_locally_until_flush(hub):
+    backend = make_backend(hub)
+    path = f"{TEAM_DIR}/bob/2026-01-02_log.md"
+
+    result = backend.write_many({path: "bob day 2\n"}, "bob log")
+    assert result["success"] and result["committed_locally"]
+    assert backend.pending_commits() == 1
+    with pytest.raises(AssertionError):
+        remote_file(hub, path)
+
+    assert backend.flush() == {"success": True, "pushed": 1}
+    assert backend.pending_commits() == 0
+    assert remote_file(hub, path) == "bob day 2\n"
+
+
+def test_teammate_push_becomes_visible_on_read(hub):
+    backend = make_backend(hub, max_age=0)
+    commit_file(hub["teammate"], f"{TEAM_DIR}/carol/2026-01-03_log.md", "carol day 3\n")
+
+    assert {e["name"] for e in backend.list_dir(TEAM_DIR)} == {"alice", "carol"}
+    assert backend.read(f"{TEAM_DIR}/carol/2026-01-03_log.md") == "carol day 3\n"
+
+
+def test_reads_are_not_refreshed_within_max_age(hub):
+    backend = make_backend(hub, max_age=3600)
+    commit_file(hub["teammate"], f"{TEAM_DIR}/carol/2026-01-03_log.md", "carol day 3\n")
+
+    assert backend.read(f"{TEAM_DIR}/carol/2026-01-03_log.md") is None
+    assert backend.sync()["success"]
+    assert backend.read(f"{TEAM_DIR}/carol/2026-01-03_log.md") == "carol day 3\n"
+
+
+def test_flush_rebases_over_teammate_push(hub):
+    backend = make_backend(hub, max_age=None)
+    mine = f"{TEAM_DIR}/bob/2026-01-04_log.md"
+    theirs = f"{TEAM_DIR}/carol/2026-01-04_log.md"
+
+    backend.write(mine, "bob day 4\n", "bob log")
+    commit_file(hub["teammate"], theirs, "carol day 4\n")
+
+    assert backend.flush()["success"]
+    assert remote_file(hub, mine) == "bob day 4\n"
+    assert remote_file(hub, theirs) == "carol day 4\n"
+    assert backend.read(theirs) == "carol day 4\n"
+
+
+def test_hub_client_sees_new_members(hub):
+    client = github_sync.HubClient(token="x", backend=make_backend(hub, max_age=0))
+    assert client.list_team_members("china") == ["alice"]
+
+    commit_file(hub["teammate"], f"{TEAM_DIR}/dave/2026-01-05_log.md", "dave day 5\n")
+
+    assert client.list_team_members("china") == ["alice", "dave"]
+    assert client.pull_log("dave", "china", "2026-01-05") == "dave day 5\n"
+
+
+def test_push_log_twice_with_same_content(hub, monkeypatch):
+    # 同一秒内推送两次时 synced_at 相同，内容完全一致
+    monkeypatch.setattr(github_sync, "create_log_content", lambda *args: "same content\n")
+    client = github_sync.HubClient(token="x", member_id="bob", backend=make_backend(hub))
+
+    first = client.push_log("hello", date="2026-01-06")
+    second = client.push_log("hello", date="2026-01-06")
+    assert first["success"] and second["success"]
+    assert second["url"] == first["url"]
+    assert client.get_backend().pending_commits() == 1